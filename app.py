@@ -8,8 +8,11 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 import networkx as nx
-import json
 import time
+import heapq
+import bisect
+
+from src.storage import load_news_data as load_article_store
 
 # Page configuration
 st.set_page_config(
@@ -102,12 +105,19 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Impact score tiers: low below 6, medium from 6, high from 8
+IMPACT_THRESHOLDS = (6, 8)
+IMPACT_COLORS = ("#44ff44", "#ff8800", "#ff4444")
+IMPACT_FILTER_TIERS = {"Low (0-6)": 0, "Medium (6-8)": 1, "High (8-10)": 2}
+
+def impact_tier(impact_score):
+    """Index of the impact tier (0 low, 1 medium, 2 high) for a score"""
+    return bisect.bisect_right(IMPACT_THRESHOLDS, impact_score)
+
 @st.cache_data
 def load_news_data():
     """Load the news dataset"""
-    with open('news.json', 'r') as f:
-        data = json.load(f)
-    return {article['id']: article for article in data['articles']}
+    return {article['id']: article for article in load_article_store('news.json')['articles']}
 
 @st.cache_data
 def get_demo_connections():
@@ -180,28 +190,34 @@ def create_network_graph(connections, query):
     G.add_node(query, size=30, color='#ff6666', type='query')
     
     # Add connected nodes
-    for conn in connections:
-        G.add_node(conn['title'][:40] + '...', 
-                  size=20 + conn['confidence'] * 10,
-                  color='#66b3ff' if conn['type'].startswith('CREATE') else '#ff9999',
-                  type=conn['type'])
-        G.add_edge(query, conn['title'][:40] + '...', 
-                  weight=conn['confidence'],
-                  type=conn['type'])
+    labels = [conn['title'][:40] + '...' for conn in connections]
+    G.add_nodes_from(
+        (label, {'size': 20 + conn['confidence'] * 10,
+                 'color': '#66b3ff' if conn['type'].startswith('CREATE') else '#ff9999',
+                 'type': conn['type']})
+        for label, conn in zip(labels, connections)
+    )
+    G.add_edges_from(
+        (query, label, {'weight': conn['confidence'], 'type': conn['type']})
+        for label, conn in zip(labels, connections)
+    )
     
     # Create layout
     pos = nx.spring_layout(G, k=3, iterations=50)
     
-    # Create edge trace
-    edge_trace = []
+    # Create edge trace: every edge shares one style, so draw them all as one
+    # trace with None breaks between segments instead of one trace per edge
+    edge_x, edge_y = [], []
     for edge in G.edges():
         x0, y0 = pos[edge[0]]
         x1, y1 = pos[edge[1]]
-        edge_trace.append(go.Scatter(x=[x0, x1, None], 
-                                   y=[y0, y1, None],
-                                   mode='lines',
-                                   line=dict(width=2, color='#888'),
-                                   hoverinfo='none'))
+        edge_x.extend((x0, x1, None))
+        edge_y.extend((y0, y1, None))
+    edge_trace = [go.Scatter(x=edge_x, 
+                             y=edge_y,
+                             mode='lines',
+                             line=dict(width=2, color='#888'),
+                             hoverinfo='none')]
     
     # Create node trace
     node_trace = go.Scatter(
@@ -334,7 +350,7 @@ def create_comparison_metrics():
 
 def display_article_card(article):
     """Display a single article in a nice card format"""
-    impact_color = "#ff4444" if article['impact_score'] >= 8 else "#ff8800" if article['impact_score'] >= 6 else "#44ff44"
+    impact_color = IMPACT_COLORS[impact_tier(article['impact_score'])]
     
     st.markdown(f"""
     <div class="article-card">
@@ -624,11 +640,7 @@ def main():
                 continue
             
             # Impact filter
-            if impact_filter == "High (8-10)" and article['impact_score'] < 8:
-                continue
-            elif impact_filter == "Medium (6-8)" and (article['impact_score'] < 6 or article['impact_score'] >= 8):
-                continue
-            elif impact_filter == "Low (0-6)" and article['impact_score'] >= 6:
+            if impact_filter in IMPACT_FILTER_TIERS and impact_tier(article['impact_score']) != IMPACT_FILTER_TIERS[impact_filter]:
                 continue
             
             # Sentiment filter
@@ -776,7 +788,7 @@ def main():
                     entity_connections[entity] = 0
                 entity_connections[entity] += 1
         
-        top_entities = sorted(entity_connections.items(), key=lambda x: x[1], reverse=True)[:20]
+        top_entities = heapq.nlargest(20, entity_connections.items(), key=lambda x: x[1])
         
         col1, col2 = st.columns(2)
         with col1:
@@ -0,0 +1,55 @@
+"""
+Cascade signature counting for the Knowledge Graph
+Kept free of config and engine imports so spawned pool workers can import it
+without OPENAI_API_KEY or the model dependencies
+"""
+
+from collections import Counter, defaultdict
+from typing import List
+
+import rustworkx as rx
+
+
+def count_cascade_signatures(graph: rx.PyDiGraph, source_indices: List[int]) -> Counter:
+    """Count edge-type signatures of 2-3 hop event paths starting at the given sources"""
+    # Successors in edge insertion order, so ties between equal-length paths
+    # break the same way as NetworkX's BFS over its adjacency dicts
+    successors = defaultdict(list)
+    for source_idx, target_idx, edge_type in graph.weighted_edge_list():
+        successors[source_idx].append((target_idx, edge_type))
+    
+    signature_counter = Counter()
+    
+    for source_idx in source_indices:
+        # Level-by-level BFS cut off at 3 hops; the first path to reach a node is its shortest
+        signatures = {source_idx: ()}
+        frontier = [source_idx]
+        for _ in range(3):
+            next_frontier = []
+            for node_idx in frontier:
+                for target_idx, edge_type in successors[node_idx]:
+                    if target_idx not in signatures:
+                        signatures[target_idx] = signatures[node_idx] + (edge_type,)
+                        next_frontier.append(target_idx)
+            frontier = next_frontier
+        
+        for target_idx, signature in signatures.items():
+            if len(signature) >= 2 and graph[target_idx].startswith('event_'):
+                signature_counter[signature] += 1
+    
+    return signature_counter
+
+
+# Event graph broadcast once to each cascade worker process
+_worker_graph = None
+
+
+def init_cascade_worker(graph: rx.PyDiGraph):
+    """Store the event graph in a cascade worker process"""
+    global _worker_graph
+    _worker_graph = graph
+
+
+def count_cascade_shard(source_indices: List[int]) -> Counter:
+    """Count cascade signatures for one shard of source events"""
+    return count_cascade_signatures(_worker_graph, source_indices)
@@ -3,6 +3,7 @@ Causation Analyzer - Builds cause-effect chains from discovered relationships
 """
 
 import json
+import heapq
 import logging
 from typing import List, Dict, Any, Tuple, Optional, Set
 from dataclasses import dataclass, field
@@ -14,7 +15,8 @@ from openai import OpenAI
 from .config import (
     OPENAI_API_KEY, DEFAULT_MODEL, ADVANCED_MODEL,
     MAX_CHAIN_DEPTH, CAUSATION_PATTERNS,
-    IMPACT_LEVELS, TEMPORAL_WINDOW_DAYS
+    IMPACT_LEVELS, TEMPORAL_WINDOW_DAYS,
+    API_TIMEOUT_SECONDS, API_MAX_RETRIES
 )
 from .relationship_engine import RelationshipDiscoveryEngine, Relationship
 
@@ -115,7 +117,7 @@ class CausationAnalyzer:
     def __init__(self, relationship_engine: RelationshipDiscoveryEngine):
         """Initialize with a relationship discovery engine"""
         self.relationship_engine = relationship_engine
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
+        self.client = OpenAI(api_key=OPENAI_API_KEY, timeout=API_TIMEOUT_SECONDS, max_retries=API_MAX_RETRIES)
         self.causation_graph = nx.DiGraph()
         
         # Build initial causation graph
@@ -128,43 +130,31 @@ class CausationAnalyzer:
         logger.info("Building causation graph...")
         
         # Add all articles as nodes
-        for article_id, article in self.relationship_engine.articles.items():
-            self.causation_graph.add_node(
-                article_id,
-                title=article['title'],
-                timestamp=article['timestamp'],
-                impact_score=article.get('impact_score', 5.0),
-                entities=article.get('entities', []),
-                category=article.get('category', 'Unknown')
-            )
+        self.causation_graph.add_nodes_from(
+            (article_id, {
+                'title': article['title'],
+                'timestamp': article['timestamp'],
+                'impact_score': article.get('impact_score', 5.0),
+                'entities': article.get('entities', []),
+                'category': article.get('category', 'Unknown')
+            })
+            for article_id, article in self.relationship_engine.articles.items()
+        )
         
-        # Add relationships as edges
-        processed_articles = set()
-        for article_id in self.relationship_engine.articles.keys():
-            if article_id in processed_articles:
-                continue
-            
-            relationships = self.relationship_engine.discover_relationships(article_id)
-            for rel in relationships:
-                # Calculate temporal gap
-                source_time = datetime.fromisoformat(
-                    self.relationship_engine.articles[rel.source_id]['timestamp'].replace('Z', '+00:00')
-                )
-                target_time = datetime.fromisoformat(
-                    self.relationship_engine.articles[rel.target_id]['timestamp'].replace('Z', '+00:00')
-                )
-                temporal_gap = (target_time - source_time).days
-                
-                self.causation_graph.add_edge(
-                    rel.source_id,
-                    rel.target_id,
-                    relationship_type=rel.relationship_type,
-                    confidence=rel.confidence,
-                    explanation=rel.explanation,
-                    temporal_gap_days=temporal_gap
-                )
-            
-            processed_articles.add(article_id)
+        # Add relationships as edges, with temporal gaps from the engine's pre-parsed timestamps
+        all_relationships = self.relationship_engine.discover_relationships_many(
+            list(self.relationship_engine.articles.keys())
+        )
+        self.causation_graph.add_edges_from(
+            (rel.source_id, rel.target_id, {
+                'relationship_type': rel.relationship_type,
+                'confidence': rel.confidence,
+                'explanation': rel.explanation,
+                'temporal_gap_days': self.relationship_engine.temporal_gap_days(rel.source_id, rel.target_id)
+            })
+            for relationships in all_relationships.values()
+            for rel in relationships
+        )
         
         logger.info(f"Built graph with {self.causation_graph.number_of_edges()} relationships")
     
@@ -425,13 +415,8 @@ class CausationAnalyzer:
                 except nx.NetworkXNoPath:
                     continue
         
-        # Sort by impact
-        root_causes.sort(
-            key=lambda x: x['root_article']['impact_score'], 
-            reverse=True
-        )
-        
-        return root_causes[:5]  # Top 5 root causes
+        # Top 5 root causes by impact
+        return heapq.nlargest(5, root_causes, key=lambda x: x['root_article']['impact_score'])
     
     def track_ripple_effects(self, article_id: int, max_hops: int = 3) -> Dict[str, Any]:
         """
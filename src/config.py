@@ -17,8 +17,15 @@ if not OPENAI_API_KEY:
 # Model Configuration
 DEFAULT_MODEL = "gpt-3.5-turbo"
 ADVANCED_MODEL = "gpt-4"  # For complex reasoning
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"  # Sentence encoder for article similarity
+EMBEDDING_BATCH_SIZE = 64  # Texts per encoder forward pass
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")  # "onnx" runs an int8-quantized export on CPU
+EMBEDDING_ONNX_FILE = "onnx/model_quint8_avx2.onnx"  # Quantized export published in the model repo
 MODEL_TEMPERATURE = 0.3  # Low temperature for consistency
 MAX_TOKENS = 1000
+API_TIMEOUT_SECONDS = 15.0  # Per-request timeout for OpenAI calls
+API_MAX_RETRIES = 3  # SDK retries 429/5xx/connection errors with exponential backoff
+MAX_CONCURRENT_GPT_REQUESTS = 20  # Upper bound on GPT requests in flight at once
 
 # Relationship Types
 RELATIONSHIP_TYPES = {
@@ -98,6 +105,10 @@ SIMILARITY_THRESHOLD = 0.7  # For entity matching
 # Cache Configuration
 CACHE_DIR = "cache"
 CACHE_TTL_SECONDS = 3600  # 1 hour
+RELATIONSHIP_CACHE_TTL_SECONDS = CACHE_TTL_SECONDS  # Keys hash article content and model; the TTL only bounds cache growth
+RELATIONSHIP_MEMORY_CACHE_SIZE = 1024  # Per-engine in-memory LRU tier in front of the disk cache
+CACHE_SHARDS = 8  # Separate SQLite files so concurrent writers rarely contend
+ANALYSIS_CACHE_SIZE_LIMIT = 256 * 1024 * 1024  # Bytes; least-recently-used analyses are evicted first
 ENABLE_CACHE = True
 
 # Analysis Settings
@@ -105,6 +116,12 @@ MAX_RELATIONSHIPS_PER_ARTICLE = 20
 BATCH_SIZE_FOR_GPT = 5  # Process articles in batches
 MAX_CHAIN_DEPTH = 5  # Maximum depth for causation chains
 ENABLE_FULL_SCAN = True  # Scan all articles for hidden connections
+MAX_GPT_CANDIDATES = None  # Optional cap on top-ranked candidates per article sent to GPT; None sends all
+# Shard cascade detection across spawned processes above this many events; None always counts serially.
+# Scripts that build a KnowledgeGraph at import time need an `if __name__ == "__main__":` guard
+# (otherwise the workers fail and detection falls back to serial)
+PARALLEL_CASCADE_MIN_EVENTS = 1000
+BULK_RELATIONSHIP_MIN_ARTICLES = 500  # warm_relationship_cache uses the Batch API (half price, up to 24h) above this size
 
 # Graph Configuration
 GRAPH_NODE_COLORS = {
@@ -175,8 +192,14 @@ def get_config() -> Dict[str, Any]:
             'openai_key': OPENAI_API_KEY,
             'default_model': DEFAULT_MODEL,
             'advanced_model': ADVANCED_MODEL,
+            'embedding_model': EMBEDDING_MODEL,
+            'embedding_batch_size': EMBEDDING_BATCH_SIZE,
+            'embedding_backend': EMBEDDING_BACKEND,
             'temperature': MODEL_TEMPERATURE,
-            'max_tokens': MAX_TOKENS
+            'max_tokens': MAX_TOKENS,
+            'timeout': API_TIMEOUT_SECONDS,
+            'max_retries': API_MAX_RETRIES,
+            'max_concurrent_requests': MAX_CONCURRENT_GPT_REQUESTS
         },
         'relationships': RELATIONSHIP_TYPES,
         'impact_levels': IMPACT_LEVELS,
@@ -189,13 +212,20 @@ def get_config() -> Dict[str, Any]:
         'cache': {
             'directory': CACHE_DIR,
             'ttl': CACHE_TTL_SECONDS,
+            'relationship_ttl': RELATIONSHIP_CACHE_TTL_SECONDS,
+            'relationship_memory_size': RELATIONSHIP_MEMORY_CACHE_SIZE,
+            'shards': CACHE_SHARDS,
+            'analysis_size_limit': ANALYSIS_CACHE_SIZE_LIMIT,
             'enabled': ENABLE_CACHE
         },
         'analysis': {
             'max_relationships': MAX_RELATIONSHIPS_PER_ARTICLE,
             'batch_size': BATCH_SIZE_FOR_GPT,
             'max_chain_depth': MAX_CHAIN_DEPTH,
-            'full_scan': ENABLE_FULL_SCAN
+            'full_scan': ENABLE_FULL_SCAN,
+            'max_gpt_candidates': MAX_GPT_CANDIDATES,
+            'parallel_cascade_min_events': PARALLEL_CASCADE_MIN_EVENTS,
+            'bulk_relationship_min_articles': BULK_RELATIONSHIP_MIN_ARTICLES
         },
         'patterns': CAUSATION_PATTERNS,
         'industries': INDUSTRY_CATEGORIES
@@ -3,18 +3,21 @@ Impact Predictor - Predicts future impacts based on historical patterns and curr
 """
 
 import json
+import heapq
 import logging
 from typing import List, Dict, Any, Tuple, Optional
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import numpy as np
+import orjson
 from openai import OpenAI
 from collections import defaultdict
 
 from .config import (
     OPENAI_API_KEY, DEFAULT_MODEL, ADVANCED_MODEL,
     CAUSATION_PATTERNS, INDUSTRY_CATEGORIES,
-    IMPACT_LEVELS, RELATIONSHIP_TYPES
+    IMPACT_LEVELS, RELATIONSHIP_TYPES,
+    API_TIMEOUT_SECONDS, API_MAX_RETRIES
 )
 from .relationship_engine import RelationshipDiscoveryEngine
 from .causation_analyzer import CausationAnalyzer, CausationChain
@@ -81,7 +84,12 @@ class ImpactPredictor:
         """Initialize with relationship and causation engines"""
         self.relationship_engine = relationship_engine
         self.causation_analyzer = causation_analyzer
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
+        self.client = OpenAI(api_key=OPENAI_API_KEY, timeout=API_TIMEOUT_SECONDS, max_retries=API_MAX_RETRIES)
+        
+        # Per-article features aligned with the engine's article order, for vectorized scoring
+        articles = [relationship_engine.articles[article_id] for article_id in relationship_engine.article_ids]
+        self._article_categories = np.array([article.get('category') for article in articles], dtype=object)
+        self._article_impacts = np.array([article.get('impact_score', 5.0) for article in articles], dtype=np.float64)
         
         # Build historical pattern database
         self._build_pattern_database()
@@ -168,10 +176,8 @@ class ImpactPredictor:
             if prediction.estimated_timeframe_days[0] <= time_horizon_days:
                 predictions.append(prediction)
         
-        # Sort by confidence
-        predictions.sort(key=lambda p: p.confidence, reverse=True)
-        
-        return predictions[:10]  # Top 10 predictions
+        # Top 10 predictions by confidence
+        return heapq.nlargest(10, predictions, key=lambda p: p.confidence)
     
     def _find_event_article(self, event_description: str) -> Optional[Dict[str, Any]]:
         """Find article matching event description"""
@@ -194,49 +200,38 @@ class ImpactPredictor:
     
     def _find_similar_events(self, event: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Find historically similar events"""
-        similar_events = []
+        engine = self.relationship_engine
         
         # Get event characteristics
         event_category = event.get('category', 'Unknown')
         event_entities = set(event.get('entities', []))
         event_impact = event.get('impact_score', 5.0)
+        event_embedding = engine.article_embedding(event.get('id'))
         
-        for article in self.relationship_engine.articles.values():
-            if article['id'] == event.get('id'):
-                continue
-            
-            # Calculate similarity
-            similarity_score = 0
-            
-            # Category match
-            if article.get('category') == event_category:
-                similarity_score += 0.3
-            
-            # Entity overlap
-            article_entities = set(article.get('entities', []))
-            if event_entities and article_entities:
-                overlap = len(event_entities & article_entities) / len(event_entities)
-                similarity_score += overlap * 0.3
-            
-            # Impact similarity
-            impact_diff = abs(article.get('impact_score', 5.0) - event_impact)
-            similarity_score += (10 - impact_diff) / 10 * 0.2
-            
-            # Content similarity (via embeddings if available)
-            if 'embedding' in event and 'embedding' in article:
-                embedding_sim = np.dot(event['embedding'], article['embedding'])
-                similarity_score += float(embedding_sim) * 0.2
-            
-            if similarity_score > 0.5:
-                similar_events.append({
-                    'article': article,
-                    'similarity': similarity_score
-                })
+        # Score every article at once
+        # Category match
+        similarity = np.where(self._article_categories == event_category, 0.3, 0.0)
+        
+        # Entity overlap
+        if event_entities:
+            similarity += engine.shared_entity_counts(event_entities) / len(event_entities) * 0.3
+        
+        # Impact similarity
+        similarity += (10 - np.abs(self._article_impacts - event_impact)) / 10 * 0.2
         
-        # Sort by similarity
-        similar_events.sort(key=lambda x: x['similarity'], reverse=True)
+        # Content similarity (via embeddings if the event is a loaded article)
+        if event_embedding is not None:
+            similarity += (engine.embedding_matrix @ event_embedding).astype(np.float64) * 0.2
         
-        return [se['article'] for se in similar_events[:10]]
+        candidates = similarity > 0.5
+        if event.get('id') in engine.article_index:
+            candidates[engine.article_index[event['id']]] = False
+        
+        # Top 10 by similarity; stable so ties keep article order
+        positions = np.flatnonzero(candidates)
+        top = positions[np.argsort(-similarity[positions], kind='stable')[:10]]
+        
+        return [engine.articles[engine.article_ids[idx]] for idx in top]
     
     def _analyze_event_patterns(self, 
                               event: Dict[str, Any], 
@@ -285,17 +280,17 @@ class ImpactPredictor:
         """Generate predictions using GPT based on patterns"""
         
         # Prepare pattern summary
-        top_effects = sorted(
+        top_effects = heapq.nlargest(
+            5,
             pattern_analysis['common_effects'].items(), 
-            key=lambda x: x[1], 
-            reverse=True
-        )[:5]
+            key=lambda x: x[1]
+        )
         
-        top_industries = sorted(
+        top_industries = heapq.nlargest(
+            5,
             pattern_analysis['affected_industries'].items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:5]
+            key=lambda x: x[1]
+        )
         
         prompt = f"""
 Based on historical patterns, predict the likely future impacts of this event:
@@ -344,7 +339,7 @@ Return a JSON object:
                 response_format={"type": "json_object"}
             )
             
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(response.choices[0].message.content)
             return result.get('predictions', [])
             
         except Exception as e:
@@ -452,7 +447,7 @@ Return JSON:
                 response_format={"type": "json_object"}
             )
             
-            return json.loads(response.choices[0].message.content)
+            return orjson.loads(response.choices[0].message.content)
             
         except Exception as e:
             logger.error(f"Error analyzing cross-industry effects: {e}")
@@ -528,7 +523,7 @@ Return JSON:
                 response_format={"type": "json_object"}
             )
             
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(response.choices[0].message.content)
             return (result['min_days'], result['max_days'])
             
         except Exception as e:
@@ -584,7 +579,7 @@ Return JSON:
                 response_format={"type": "json_object"}
             )
             
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(response.choices[0].message.content)
             return result.get('indicators', [])
             
         except Exception as e:
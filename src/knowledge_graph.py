@@ -2,20 +2,27 @@
 Knowledge Graph Builder - Constructs and queries the news relationship knowledge graph
 """
 
+import os
+import gzip
 import json
 import logging
+from collections import Counter, defaultdict
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import List, Dict, Any, Tuple, Optional, Set
 from dataclasses import dataclass, field
 from datetime import datetime
 import networkx as nx
-import matplotlib.pyplot as plt
-from pyvis.network import Network
+import rustworkx as rx
 import numpy as np
 
 from .config import (
     GRAPH_NODE_COLORS, GRAPH_EDGE_COLORS,
-    RELATIONSHIP_TYPES, IMPACT_LEVELS
+    RELATIONSHIP_TYPES, IMPACT_LEVELS,
+    PARALLEL_CASCADE_MIN_EVENTS
 )
+from .cascade import count_cascade_signatures, init_cascade_worker, count_cascade_shard
 from .relationship_engine import RelationshipDiscoveryEngine, Relationship
 from .causation_analyzer import CausationAnalyzer, CausationChain
 
@@ -23,8 +30,32 @@ from .causation_analyzer import CausationAnalyzer, CausationChain
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Visualization settings shared by every rendered subgraph
+_PHYSICS_OPTIONS = json.dumps({
+    'physics': {
+        'enabled': True,
+        'solver': 'forceAtlas2Based',
+        'stabilization': {
+            'iterations': 100
+        }
+    }
+})
+
+# Node ID prefix -> (color, size)
+_NODE_STYLES = {
+    'event': (GRAPH_NODE_COLORS['event'], 25),
+    'entity': (GRAPH_NODE_COLORS['entity'], 20),
+    'concept': (GRAPH_NODE_COLORS['concept'], 15)
+}
+_DEFAULT_NODE_STYLE = ('#97c2fc', 10)  # pyvis defaults
+
+# Neighbors expanded per node in a rendered subgraph, shrinking with each hop;
+# the rest collapse into one "+N more" node so browser physics stays responsive
+_SUBGRAPH_NEIGHBOR_CAP = 10
+_SUBGRAPH_MIN_NEIGHBOR_CAP = 3
 
-@dataclass
+
+@dataclass(slots=True)
 class GraphNode:
     """Represents a node in the knowledge graph"""
     node_id: str
@@ -41,7 +72,7 @@ class GraphNode:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class GraphEdge:
     """Represents an edge in the knowledge graph"""
     source_id: str
@@ -60,7 +91,7 @@ class GraphEdge:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Pattern:
     """Represents a recurring pattern in the graph"""
     pattern_id: str
@@ -91,6 +122,12 @@ class KnowledgeGraph:
         # Initialize graph
         self.graph = nx.MultiDiGraph()
         
+        # rustworkx mirror of the graph topology for the heavy path/cycle
+        # algorithms; node payloads are the NetworkX node IDs and edge
+        # payloads the first edge key between two nodes
+        self._rx_graph = rx.PyDiGraph(multigraph=False)
+        self._nx_to_rx = {}
+        
         # Node and edge registries
         self.nodes = {}
         self.edges = {}
@@ -98,6 +135,11 @@ class KnowledgeGraph:
         # Pattern registry
         self.patterns = {}
         
+        # Integer encoding of cascade pattern edge types for vectorized matching
+        self._edge_type_vocab = {}
+        self._cascade_patterns = []
+        self._pattern_edge_mask = np.zeros((0, 0), dtype=np.float32)
+        
         # Build initial graph
         self._build_graph()
         
@@ -155,7 +197,7 @@ class KnowledgeGraph:
         )
         
         # Add to graph
-        self.graph.add_node(
+        self._add_graph_node(
             event_id,
             **event_node.properties,
             node_type='event',
@@ -187,7 +229,7 @@ class KnowledgeGraph:
         )
         
         # Add to graph
-        self.graph.add_edge(
+        self._add_graph_edge(
             source_id,
             target_id,
             key=relationship.relationship_type,
@@ -198,6 +240,26 @@ class KnowledgeGraph:
         edge_key = (source_id, target_id, relationship.relationship_type)
         self.edges[edge_key] = edge
     
+    def _add_graph_node(self, node_id: str, **attributes):
+        """Add a node to the graph and its rustworkx mirror"""
+        self.graph.add_node(node_id, **attributes)
+        self._rx_index(node_id)
+    
+    def _add_graph_edge(self, source_id: str, target_id: str, key: str, **attributes):
+        """Add an edge to the graph and its rustworkx mirror"""
+        self.graph.add_edge(source_id, target_id, key=key, **attributes)
+        
+        source_idx = self._rx_index(source_id)
+        target_idx = self._rx_index(target_id)
+        if not self._rx_graph.has_edge(source_idx, target_idx):
+            self._rx_graph.add_edge(source_idx, target_idx, key)
+    
+    def _rx_index(self, node_id: str) -> int:
+        """Get the rustworkx index for a node, adding it to the mirror if needed"""
+        if node_id not in self._nx_to_rx:
+            self._nx_to_rx[node_id] = self._rx_graph.add_node(node_id)
+        return self._nx_to_rx[node_id]
+    
     def _add_entity_nodes(self):
         """Add entity nodes and connect them to events"""
         entity_events = defaultdict(list)
@@ -219,7 +281,7 @@ class KnowledgeGraph:
                         properties={'entity_type': 'organization'}  # Could be enhanced
                     )
                     
-                    self.graph.add_node(
+                    self._add_graph_node(
                         entity_id,
                         **entity_node.properties,
                         node_type='entity',
@@ -228,7 +290,7 @@ class KnowledgeGraph:
                     self.nodes[entity_id] = entity_node
                 
                 # Connect entity to event
-                self.graph.add_edge(
+                self._add_graph_edge(
                     entity_id,
                     event_id,
                     key='MENTIONED_IN',
@@ -239,12 +301,14 @@ class KnowledgeGraph:
         """Add relationships between events"""
         processed = set()
         
-        for article_id in self.relationship_engine.articles.keys():
+        # Discover relationships for every article concurrently
+        all_relationships = self.relationship_engine.discover_relationships_many(
+            list(self.relationship_engine.articles.keys())
+        )
+        
+        for article_id, relationships in all_relationships.items():
             if article_id in processed:
                 continue
-                
-            # Discover relationships
-            relationships = self.relationship_engine.discover_relationships(article_id)
             
             for rel in relationships:
                 self.add_relationship(rel)
@@ -270,7 +334,7 @@ class KnowledgeGraph:
                     properties={'concept_type': 'category'}
                 )
                 
-                self.graph.add_node(
+                self._add_graph_node(
                     category_id,
                     **concept_node.properties,
                     node_type='concept',
@@ -282,7 +346,7 @@ class KnowledgeGraph:
             for article_id, article in self.relationship_engine.articles.items():
                 if article.get('category') == category:
                     event_id = f"event_{article_id}"
-                    self.graph.add_edge(
+                    self._add_graph_edge(
                         event_id,
                         category_id,
                         key='BELONGS_TO',
@@ -310,46 +374,79 @@ class KnowledgeGraph:
         for pattern in patterns_found:
             self.patterns[pattern.pattern_id] = pattern
         
+        self._build_pattern_index()
+        
         logger.info(f"Detected {len(self.patterns)} patterns")
     
+    def _build_pattern_index(self):
+        """Encode cascade pattern edge types as integer IDs for vectorized matching"""
+        self._cascade_patterns = [
+            pattern for pattern in self.patterns.values()
+            if pattern.pattern_type == 'cascade'
+        ]
+        
+        self._edge_type_vocab = {}
+        for pattern in self._cascade_patterns:
+            for edge_type in pattern.edges:
+                self._edge_type_vocab.setdefault(edge_type, len(self._edge_type_vocab))
+        
+        # One row per cascade pattern, one column per edge type it contains
+        self._pattern_edge_mask = np.zeros(
+            (len(self._cascade_patterns), len(self._edge_type_vocab)),
+            dtype=np.float32
+        )
+        for row, pattern in enumerate(self._cascade_patterns):
+            type_ids = [self._edge_type_vocab[edge_type] for edge_type in set(pattern.edges)]
+            self._pattern_edge_mask[row, type_ids] = 1.0
+    
     def _find_cascade_patterns(self) -> List[Pattern]:
         """Find cascade patterns (chain reactions)"""
         patterns = []
-        pattern_counter = defaultdict(int)
         
-        # Look for paths of length 3+
-        for node in self.graph.nodes():
-            if not node.startswith('event_'):
-                continue
-                
-            paths = nx.single_source_shortest_path(self.graph, node, cutoff=3)
+        # Cascades only run through events (category nodes are sinks and entity
+        # nodes are never reached), so the event subgraph gives the same paths
+        event_indices = [
+            idx for node_id, idx in self._nx_to_rx.items()
+            if node_id.startswith('event_')
+        ]
+        event_graph = self._rx_graph.subgraph(event_indices)
+        sources = list(event_graph.node_indices())
+        
+        # Each source is independent; process pools only pay off on large graphs
+        if PARALLEL_CASCADE_MIN_EVENTS is not None and len(sources) > PARALLEL_CASCADE_MIN_EVENTS:
+            workers = os.cpu_count() or 1
+            shards = [sources[i::workers] for i in range(workers)]
             
-            for target, path in paths.items():
-                if len(path) >= 3 and target.startswith('event_'):
-                    # Extract pattern signature
-                    pattern_sig = []
-                    for i in range(len(path) - 1):
-                        edges = self.graph.get_edge_data(path[i], path[i + 1])
-                        if edges:
-                            edge_types = list(edges.keys())
-                            pattern_sig.append(edge_types[0])
-                    
-                    if pattern_sig:
-                        pattern_key = tuple(pattern_sig)
-                        pattern_counter[pattern_key] += 1
-        
-        # Create pattern objects for frequent patterns
-        for pattern_sig, count in pattern_counter.items():
-            if count >= 2:  # At least 2 occurrences
-                pattern = Pattern(
-                    pattern_id=f"cascade_{len(patterns)}",
-                    pattern_type='cascade',
-                    nodes=[],  # Would be filled with specific instances
-                    edges=list(pattern_sig),
-                    frequency=count,
-                    examples=[]
-                )
-                patterns.append(pattern)
+            # Spawned everywhere (not forked) so every platform behaves like macOS/Windows
+            # and no model threads are copied into the workers
+            try:
+                with ProcessPoolExecutor(max_workers=workers,
+                                         mp_context=multiprocessing.get_context("spawn"),
+                                         initializer=init_cascade_worker,
+                                         initargs=(event_graph,)) as executor:
+                    pattern_counter = sum(executor.map(count_cascade_shard, shards), Counter())
+            except BrokenProcessPool as e:
+                # e.g. a caller without a __main__ guard re-running its script in the workers
+                logger.warning(f"Cascade worker pool failed ({e}); counting serially")
+                pattern_counter = count_cascade_signatures(event_graph, sources)
+        else:
+            pattern_counter = count_cascade_signatures(event_graph, sources)
+        
+        # Create pattern objects for frequent patterns, most frequent first; the
+        # signature space is bounded by (edge types)^3, so no streaming pruning
+        for pattern_sig, count in pattern_counter.most_common():
+            if count < 2:  # At least 2 occurrences
+                break
+            
+            pattern = Pattern(
+                pattern_id=f"cascade_{len(patterns)}",
+                pattern_type='cascade',
+                nodes=[],  # Would be filled with specific instances
+                edges=list(pattern_sig),
+                frequency=count,
+                examples=[]
+            )
+            patterns.append(pattern)
         
         return patterns
     
@@ -381,10 +478,9 @@ class KnowledgeGraph:
         
         # Find simple cycles
         try:
-            cycles = list(nx.simple_cycles(self.graph))
-            
-            for cycle in cycles:
-                if 2 <= len(cycle) <= 4:  # Reasonable cycle length
+            for cycle_indices in rx.simple_cycles(self._rx_graph):
+                if 2 <= len(cycle_indices) <= 4:  # Reasonable cycle length
+                    cycle = [self._rx_graph[idx] for idx in cycle_indices]
                     pattern = Pattern(
                         pattern_id=f"loop_{len(patterns)}",
                         pattern_type='feedback_loop',
@@ -422,16 +518,23 @@ class KnowledgeGraph:
             logger.warning(f"Could not find nodes for {from_event} → {to_effect}")
             return []
         
-        # Find all simple paths
-        paths = []
-        try:
-            for path in nx.all_simple_paths(self.graph, from_id, to_id, cutoff=max_length):
-                path_details = self._get_path_details(path)
-                paths.append(path_details)
-        except nx.NetworkXNoPath:
+        # Find all simple paths (rustworkx counts path depth in nodes, not edges)
+        rx_paths = rx.digraph_all_simple_paths(
+            self._rx_graph,
+            self._nx_to_rx[from_id],
+            self._nx_to_rx[to_id],
+            cutoff=max_length + 1
+        )
+        if not rx_paths:
             logger.info(f"No path found from {from_event} to {to_effect}")
         
-        return paths[:5]  # Return top 5 paths
+        # Only translate the returned paths back to node IDs
+        paths = []
+        for rx_path in rx_paths[:5]:  # Return top 5 paths
+            path = [self._rx_graph[idx] for idx in rx_path]
+            paths.append(self._get_path_details(path))
+        
+        return paths
     
     def _find_node_id(self, query: str, node_type: str = None) -> Optional[str]:
         """Find node ID by query string"""
@@ -499,37 +602,33 @@ class KnowledgeGraph:
         if 'id' in event:
             event_id = f"event_{event['id']}"
             
-            # Check cascade patterns
-            for pattern in self.patterns.values():
-                if pattern.pattern_type == 'cascade':
-                    # Simple similarity: check if event participates in similar cascades
-                    similarity = self._calculate_pattern_similarity(event_id, pattern)
-                    if similarity > 0.5:
-                        similar_patterns.append(pattern)
+            # Score all cascade patterns at once: each of the event's edges whose
+            # type appears in a pattern adds 0.2 to that pattern's similarity
+            edge_type_counts = self._event_edge_type_counts(event_id)
+            similarities = np.minimum(self._pattern_edge_mask @ edge_type_counts * 0.2, 1.0)
+            
+            for pattern, similarity in zip(self._cascade_patterns, similarities):
+                if similarity > 0.5:
+                    similar_patterns.append(pattern)
         
         return similar_patterns
     
-    def _calculate_pattern_similarity(self, 
-                                    event_id: str, 
-                                    pattern: Pattern) -> float:
-        """Calculate similarity between an event and a pattern"""
-        # Simplified similarity calculation
-        similarity = 0.0
-        
-        # Check if event has similar connections
-        event_edges = list(self.graph.edges(event_id, keys=True))
-        pattern_edge_types = set(pattern.edges)
-        
-        for _, _, edge_type in event_edges:
-            if edge_type in pattern_edge_types:
-                similarity += 0.2
-        
-        return min(similarity, 1.0)
+    def _event_edge_type_counts(self, event_id: str) -> np.ndarray:
+        """Count an event's outgoing edges per encoded pattern edge type"""
+        counts = np.zeros(len(self._edge_type_vocab), dtype=np.float32)
+        
+        for _, _, edge_type in self.graph.edges(event_id, keys=True):
+            type_id = self._edge_type_vocab.get(edge_type)
+            if type_id is not None:
+                counts[type_id] += 1
+        
+        return counts
     
     def visualize_subgraph(self, 
                           center_node: str,
                           depth: int = 2,
-                          output_file: str = "knowledge_graph.html"):
+                          output_file: str = "knowledge_graph.html",
+                          compress: bool = False):
         """
         Visualize a subgraph centered on a specific node
         
@@ -537,7 +636,11 @@ class KnowledgeGraph:
             center_node: Central node (event title or ID)
             depth: How many hops to include
             output_file: Output HTML file
+            compress: Also write a gzipped copy to output_file + '.gz' for serving
         """
+        # Imported here so callers that never visualize skip the pyvis import
+        from pyvis.network import Network
+        
         # Find center node ID
         center_id = self._find_node_id(center_node)
         if not center_id:
@@ -547,69 +650,108 @@ class KnowledgeGraph:
         # Get subgraph
         subgraph_nodes = set([center_id])
         current_level = [center_id]
+        collapsed = {}  # node -> neighbors left out of the rendering
         
-        for _ in range(depth):
+        for level in range(depth):
+            cap = max(_SUBGRAPH_MIN_NEIGHBOR_CAP, _SUBGRAPH_NEIGHBOR_CAP - 2 * level)
             next_level = []
             for node in current_level:
-                # Add predecessors and successors
+                # Add predecessors and successors, up to this level's cap
                 predecessors = list(self.graph.predecessors(node))
                 successors = list(self.graph.successors(node))
                 
-                for neighbor in predecessors + successors:
-                    if neighbor not in subgraph_nodes:
-                        subgraph_nodes.add(neighbor)
-                        next_level.append(neighbor)
+                new_neighbors = [
+                    neighbor for neighbor in dict.fromkeys(predecessors + successors)
+                    if neighbor not in subgraph_nodes
+                ]
+                subgraph_nodes.update(new_neighbors[:cap])
+                next_level.extend(new_neighbors[:cap])
+                if len(new_neighbors) > cap:
+                    collapsed[node] = len(new_neighbors) - cap
             
             current_level = next_level
         
         # Create subgraph
         subgraph = self.graph.subgraph(subgraph_nodes)
         
-        # Create interactive visualization
+        # Create interactive visualization. Node and edge dicts are built directly:
+        # add_node scans the id list on every call, undirected add_edge scans every
+        # edge, and from_nx rewrote sizes and weights in the graph's own attributes.
+        # This relies on Network's list layout, so pyvis is pinned in requirements.txt
         net = Network(height="750px", width="100%", bgcolor="#222222", font_color="white")
-        net.from_nx(subgraph)
-        
-        # Customize appearance
-        for node in net.nodes:
-            node_id = node['id']
-            if node_id.startswith('event_'):
-                node['color'] = GRAPH_NODE_COLORS['event']
-                node['size'] = 25
-            elif node_id.startswith('entity_'):
-                node['color'] = GRAPH_NODE_COLORS['entity']
-                node['size'] = 20
-            elif node_id.startswith('concept_'):
-                node['color'] = GRAPH_NODE_COLORS['concept']
-                node['size'] = 15
+        
+        nodes = []
+        for node_id, attributes in subgraph.nodes(data=True):
+            color, size = _NODE_STYLES.get(node_id.split('_', 1)[0], _DEFAULT_NODE_STYLE)
+            node = {
+                **attributes,
+                'id': node_id,
+                'label': attributes.get('label') or node_id,
+                'shape': 'dot',
+                'color': color,
+                'size': size,
+                'font': {'color': 'white'}
+            }
             
             # Highlight center node
             if node_id == center_id:
                 node['size'] = 40
                 node['font'] = {'size': 20}
-        
-        # Customize edges
-        for edge in net.edges:
-            edge_type = edge.get('key', 'UNKNOWN')
+            nodes.append(node)
+        
+        edges = []
+        drawn_pairs = set()
+        for source, target, edge_type, attributes in subgraph.edges(keys=True, data=True):
+            # The network is undirected, so each node pair gets one line, as add_edge did
+            pair = frozenset((source, target))
+            if pair in drawn_pairs:
+                continue
+            drawn_pairs.add(pair)
+            
+            edge = {name: value for name, value in attributes.items() if name != 'weight'}
+            edge.update({
+                'from': source,
+                'to': target,
+                'width': attributes.get('weight', 1),
+                'title': f"{edge_type}: {attributes.get('explanation', '')}"
+            })
             if edge_type in GRAPH_EDGE_COLORS:
                 edge['color'] = GRAPH_EDGE_COLORS[edge_type]
-            edge['title'] = f"{edge_type}: {edge.get('explanation', '')}"
+            edges.append(edge)
+        
+        # One dashed summary node per node whose neighbors were capped
+        for node_id, hidden in collapsed.items():
+            summary_id = f"more_{node_id}"
+            nodes.append({
+                'id': summary_id,
+                'label': f"+{hidden} more",
+                'shape': 'dot',
+                'color': '#cccccc',
+                'size': 15,
+                'font': {'color': 'white'}
+            })
+            edges.append({'from': node_id, 'to': summary_id, 'dashes': True, 'width': 1})
+        
+        net.nodes.extend(nodes)
+        net.node_ids.extend(node['id'] for node in nodes)
+        net.node_map.update((node['id'], node) for node in nodes)
+        net.edges.extend(edges)
         
         # Set physics options
-        net.set_options("""
-        {
-            "physics": {
-                "enabled": true,
-                "solver": "forceAtlas2Based",
-                "stabilization": {
-                    "iterations": 100
-                }
-            }
-        }
-        """)
+        net.set_options(_PHYSICS_OPTIONS)
         
         # Save visualization
         net.save_graph(output_file)
         logger.info(f"Saved graph visualization to {output_file}")
+        
+        # The inlined node/edge JSON compresses well; save_graph leaves the rendered page in net.html
+        if compress:
+            with gzip.open(output_file + ".gz", "wt", encoding="utf-8", compresslevel=6) as f:
+                f.write(net.html)
+            logger.info(
+                f"Saved compressed copy to {output_file}.gz; serve it with Content-Encoding: gzip "
+                f"(e.g. nginx gzip_static on)"
+            )
     
     def get_graph_statistics(self) -> Dict[str, Any]:
         """Get statistics about the knowledge graph"""
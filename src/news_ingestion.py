@@ -3,20 +3,231 @@ News Ingestion System for Article Relationship Engine
 Automatically processes and adds news articles to news.json
 """
 
-import json
 import os
+import asyncio
+import bisect
+import hashlib
+import logging
+import time
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 import re
-from openai import OpenAI
+import weakref
+from functools import lru_cache
+import httpx
+from openai import OpenAI, AsyncOpenAI, DefaultAsyncHttpxClient
 from dotenv import load_dotenv
+import diskcache
+import orjson
+import tiktoken
+
+from .config import (
+    CACHE_DIR, ENABLE_CACHE, ANALYSIS_CACHE_SIZE_LIMIT,
+    API_TIMEOUT_SECONDS, API_MAX_RETRIES, MAX_CONCURRENT_GPT_REQUESTS
+)
+from .storage import journal_path_for, load_news_data
 
 # Load environment variables
 load_dotenv()
 
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Word tokens for the search index; applied to lowercased text
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Model for article analysis and categorization; cheaper and faster than gpt-3.5-turbo
+ANALYSIS_MODEL = "gpt-4o-mini"
+
+# Article fields filled in by GPT analysis when not provided
+ANALYSIS_FIELDS = ("entities", "tags", "sentiment", "impact_score")
+
+# Append-only journal entries to accumulate before folding them into the snapshot
+JOURNAL_COMPACTION_THRESHOLD = 1000
+
+# File write buffer; 4 KiB matches the page size on unix, Windows does better with 8 KiB
+WRITE_BUFFER_SIZE = 8192 if os.name == "nt" else 4096
+
+# Fetched article batches buffered between the monitor's poller and ingester
+MONITOR_QUEUE_SIZE = 100
+
+# Token budget for a multi-article analysis prompt
+MAX_ANALYSIS_BATCH_TOKENS = 3000
+
+# Article content sent for analysis, in tokens (about the old 600-character excerpt for English)
+ANALYSIS_CONTENT_TOKENS = 150
+
+# Fetched stories categorized per GPT call
+CATEGORY_BATCH_SIZE = 10
+
+# Batch API polling backoff (seconds)
+BATCH_POLL_INITIAL_SECONDS = 10
+BATCH_POLL_MAX_SECONDS = 300
+
+# Prompt templates. Static instructions come first and the article last so the
+# shared prefix is identical across requests and eligible for prompt caching.
+ENTITIES_PROMPT = """
+Extract key named entities from this news article. Focus on:
+- People (political figures, CEOs, etc.)
+- Organizations (companies, government bodies, etc.)  
+- Locations (countries, cities, regions)
+- Products/Technologies
+- Financial instruments
+
+Return a JSON object with a single key "entities" containing a list of the most important entities (max 10).
+"""
+
+TAGS_PROMPT = """
+Generate relevant tags for this news article. Consider:
+- Main topic/theme
+- Industry sector
+- Geographic relevance
+- Economic/political implications
+- Key concepts
+
+Return a JSON object with a single key "tags" containing a list of 3-5 lowercase hyphenated tags (e.g., "supply-chain", "trade-war").
+"""
+
+SENTIMENT_PROMPT = """
+Analyze the sentiment of this news article. Consider:
+- Overall tone and language
+- Impact on stakeholders mentioned
+- Economic/social implications
+- Forward-looking statements
+
+Return a JSON object with a single key "sentiment": one of "positive", "negative", "neutral", "mixed".
+
+If the sentiment is clearly mixed, return "neutral".
+"""
+
+IMPACT_PROMPT = """
+Assess the potential impact of this news article on a scale of 1-10. Consider:
+- Market/economic implications
+- Number of people/organizations affected
+- Geographic scope (local/national/global)
+- Urgency and time sensitivity
+- Potential for cascading effects
+- Political/regulatory implications
+
+Return a JSON object with a single key "impact_score": a number between 1.0 and 10.0.
+
+Guidelines:
+- 1-3: Low impact, local or minor news
+- 4-6: Moderate impact, regional or sector-specific
+- 7-8: High impact, national or cross-industry
+- 9-10: Critical impact, global or systemic consequences
+"""
+
+# Per-field instruction, JSON example and comment for the single-article analysis prompt
+ANALYSIS_FIELD_SPECS = {
+    "entities": (
+        "ENTITIES: Key named entities (people, organizations, locations, products/tech)",
+        '"entities": ["entity1", "entity2", ...]', "max 10"
+    ),
+    "tags": ("TAGS: 3-5 relevant lowercase hyphenated tags", '"tags": ["tag1", "tag2", ...]', "3-5 tags"),
+    "sentiment": ('SENTIMENT: "positive", "negative", or "neutral"', '"sentiment": "positive/negative/neutral"', ""),
+    "impact_score": ("IMPACT_SCORE: 1-10 based on market/economic/social implications", '"impact_score": 7.5', "1.0-10.0")
+}
+
+MULTI_ANALYSIS_PROMPT = """
+Analyze each numbered news article below. For every article provide:
+
+1. ENTITIES: Key named entities (people, organizations, locations, products/tech)
+2. TAGS: 3-5 relevant lowercase hyphenated tags
+3. SENTIMENT: "positive", "negative", or "neutral"
+4. IMPACT_SCORE: 1-10 based on market/economic/social implications
+
+Return a JSON object with a single key "analyses": an array with exactly one entry per article, in article order:
+{
+    "analyses": [
+        {
+            "entities": ["entity1", "entity2", ...],  // max 10
+            "tags": ["tag1", "tag2", ...],  // 3-5 tags
+            "sentiment": "positive/negative/neutral",
+            "impact_score": 7.5  // 1.0-10.0
+        },
+        ...
+    ]
+}
+"""
+
+# Structured output schemas: the API guarantees responses match exactly
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "entities": {"type": "array", "items": {"type": "string"}},
+        "tags": {"type": "array", "items": {"type": "string"}},
+        "sentiment": {"type": "string", "enum": ["positive", "negative", "neutral"]},
+        "impact_score": {"type": "number"}
+    },
+    "required": ["entities", "tags", "sentiment", "impact_score"],
+    "additionalProperties": False
+}
+
+ANALYSIS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "NewsAnalysis", "schema": ANALYSIS_SCHEMA, "strict": True}
+}
+
+MULTI_ANALYSIS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "NewsAnalysisBatch",
+        "schema": {
+            "type": "object",
+            "properties": {"analyses": {"type": "array", "items": ANALYSIS_SCHEMA}},
+            "required": ["analyses"],
+            "additionalProperties": False
+        },
+        "strict": True
+    }
+}
+
+NEWS_CATEGORIES = (
+    "Politics", "Finance", "Technology", "Business", "International",
+    "Environment", "Labor", "Legal", "Energy", "Healthcare",
+    "Sports", "Entertainment", "Science", "Education", "Real Estate",
+    "Transportation", "Agriculture", "Manufacturing", "Defense", "Commodities"
+)
+
+_CATEGORY_LIST = "\n".join(f"- {category}" for category in NEWS_CATEGORIES)
+
+CATEGORY_PROMPT = f"""
+Categorize this news article into one of these categories:
+{_CATEGORY_LIST}
+
+Return a JSON object with:
+{{"category": "chosen category"}}
+"""
+
+MULTI_CATEGORY_PROMPT = f"""
+Categorize each numbered news article below into one of these categories:
+{_CATEGORY_LIST}
+
+Return a JSON object with a single key "categories": an array with exactly one category per article, in article order:
+{{"categories": ["category for article 1", "category for article 2", ...]}}
+"""
+
+MULTI_CATEGORY_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "NewsCategoryBatch",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "categories": {"type": "array", "items": {"type": "string", "enum": list(NEWS_CATEGORIES)}}
+            },
+            "required": ["categories"],
+            "additionalProperties": False
+        },
+        "strict": True
+    }
+}
 
-@dataclass
+
+@dataclass(slots=True)
 class NewsArticle:
     """Data structure for a news article"""
     id: int
@@ -31,68 +242,188 @@ class NewsArticle:
     impact_score: float = 5.0
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
-        return asdict(self)
+        """Convert to dictionary for the in-memory article store"""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "content": self.content,
+            "timestamp": self.timestamp,
+            "source": self.source,
+            "category": self.category,
+            "entities": list(self.entities),
+            "tags": list(self.tags),
+            "sentiment": self.sentiment,
+            "impact_score": self.impact_score
+        }
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the tokenizer once, on first use"""
+    return tiktoken.encoding_for_model(ANALYSIS_MODEL)
+
+
+@lru_cache(maxsize=1024)
+def _truncate_tokens(text: str, max_tokens: int) -> str:
+    """Trim text to at most max_tokens tokens (cached: batch ingest formats each article twice)"""
+    # No token is longer than a few characters on average, so the tokenizer
+    # never needs to see more than a bounded prefix of a long article
+    prefix = text[:max_tokens * 8]
+    tokens = _get_encoding().encode(prefix, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return prefix
+    return _get_encoding().decode(tokens[:max_tokens])
+
+
+@lru_cache(maxsize=None)
+def _analysis_prompt(fields: Tuple[str, ...]) -> str:
+    """Instructions asking for just the given analysis fields"""
+    instructions = "\n".join(
+        f"{number}. {ANALYSIS_FIELD_SPECS[name][0]}" for number, name in enumerate(fields, 1)
+    )
+    examples = []
+    for i, name in enumerate(fields):
+        _, example, comment = ANALYSIS_FIELD_SPECS[name]
+        line = "    " + example + ("," if i < len(fields) - 1 else "")
+        examples.append(line + "  // " + comment if comment else line)
+    
+    return (
+        "\nAnalyze this news article comprehensively. Provide:\n\n" + instructions +
+        "\n\nReturn a JSON object with:\n{\n" + "\n".join(examples) + "\n}\n"
+    )
+
+
+@lru_cache(maxsize=None)
+def _analysis_response_format(fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Strict structured-output schema restricted to the given analysis fields"""
+    if fields == ANALYSIS_FIELDS:
+        return ANALYSIS_RESPONSE_FORMAT
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "NewsAnalysis",
+            "schema": {
+                "type": "object",
+                "properties": {name: ANALYSIS_SCHEMA["properties"][name] for name in fields},
+                "required": list(fields),
+                "additionalProperties": False
+            },
+            "strict": True
+        }
+    }
 
 
-class NewsIngestionEngine:
+def _missing_fields(article_data: Dict[str, Any]) -> Tuple[str, ...]:
+    """Analysis fields the caller did not supply for an article"""
+    return tuple(name for name in ANALYSIS_FIELDS if article_data.get(name) is None)
+
+
+def create_async_client(api_key: str) -> AsyncOpenAI:
+    """Async OpenAI client multiplexing concurrent requests over pooled HTTP/2 connections"""
+    return AsyncOpenAI(
+        api_key=api_key,
+        timeout=API_TIMEOUT_SECONDS,
+        max_retries=API_MAX_RETRIES,
+        # Pool sized to the request semaphore so no request waits on a connection
+        http_client=DefaultAsyncHttpxClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=MAX_CONCURRENT_GPT_REQUESTS,
+                max_keepalive_connections=MAX_CONCURRENT_GPT_REQUESTS
+            )
+        )
+    )
+
+
+class AsyncClientMixin:
+    """
+    Private event loop for the sync wrappers plus one AsyncOpenAI client per loop
+    
+    Pooled connections are bound to the loop that opened them, so a coroutine
+    run under asyncio.run() gets its own client instead of reusing this one.
+    """
+    
+    def _init_async_clients(self, api_key: str):
+        self._api_key = api_key
+        self._loop = asyncio.new_event_loop()
+        self._aclients = weakref.WeakKeyDictionary()  # event loop -> AsyncOpenAI
+    
+    @property
+    def aclient(self) -> AsyncOpenAI:
+        """Async client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        client = self._aclients.get(loop)
+        if client is None:
+            client = self._aclients[loop] = create_async_client(self._api_key)
+        return client
+    
+    async def aclose(self):
+        """Close the async client opened for the running event loop"""
+        client = self._aclients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+    
+    def close(self):
+        """Close the clients and the private event loop"""
+        if self._loop.is_closed():
+            return
+        self._loop.run_until_complete(self.aclose())
+        self._loop.close()
+        self.client.close()
+
+
+class NewsIngestionEngine(AsyncClientMixin):
     """Handles ingestion of news articles into the JSON storage"""
     
     def __init__(self, news_file_path: str = "news.json"):
         self.news_file_path = news_file_path
+        self.journal_path = journal_path_for(news_file_path)
         self.articles = self._load_existing_articles()
+        self._journal_entries = 0
+        self._store_locks = weakref.WeakKeyDictionary()  # event loop -> asyncio.Lock
+        self._next_id = 1 + max((article["id"] for article in self.articles["articles"]), default=0)
+        self._build_search_index()
+        self._build_recency_index()
         
         # GPT is required - no fallback
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY is required. Please set it in your .env file.")
         
-        self.client = OpenAI(api_key=api_key)
+        self.client = OpenAI(api_key=api_key, timeout=API_TIMEOUT_SECONDS, max_retries=API_MAX_RETRIES)
+        self._init_async_clients(api_key)
+        
+        # Analyses of previously seen articles (e.g. duplicate wire stories)
+        self.analysis_cache = diskcache.Cache(
+            os.path.join(CACHE_DIR, "analysis"),
+            size_limit=ANALYSIS_CACHE_SIZE_LIMIT,
+            eviction_policy="least-recently-used"
+        ) if ENABLE_CACHE else None
         self.use_batch_analysis = True  # Use single API call for all analysis
         
     def _load_existing_articles(self) -> Dict[str, Any]:
-        """Load existing articles from JSON file"""
-        if os.path.exists(self.news_file_path):
-            try:
-                with open(self.news_file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                print(f"Warning: Could not parse {self.news_file_path}, starting fresh")
-                return {"articles": []}
-        return {"articles": []}
+        """Load existing articles from the snapshot and journal"""
+        return load_news_data(self.news_file_path)
     
     def _get_next_id(self) -> int:
         """Get the next available article ID"""
-        if not self.articles.get("articles"):
-            return 1
-        max_id = max(article["id"] for article in self.articles["articles"])
-        return max_id + 1
+        next_id = self._next_id
+        self._next_id += 1
+        return next_id
     
     def _extract_entities(self, title: str, content: str) -> List[str]:
         """Extract named entities using GPT"""
         try:
-            prompt = f"""
-Extract key named entities from this news article. Focus on:
-- People (political figures, CEOs, etc.)
-- Organizations (companies, government bodies, etc.)  
-- Locations (countries, cities, regions)
-- Products/Technologies
-- Financial instruments
-
-Title: {title}
-Content: {content[:500]}...
-
-Return a JSON object with a single key "entities" containing a list of the most important entities (max 10).
-"""
+            prompt = ENTITIES_PROMPT + f"\nTitle: {title}\nContent: {content[:500]}...\n"
             
             response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+                model=ANALYSIS_MODEL,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.3,
                 response_format={"type": "json_object"}
             )
             
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(response.choices[0].message.content)
             return result.get("entities", [])[:10]
             
         except Exception as e:
@@ -102,29 +433,16 @@ Return a JSON object with a single key "entities" containing a list of the most
     def _generate_tags(self, title: str, content: str, category: str) -> List[str]:
         """Generate tags using GPT"""
         try:
-            prompt = f"""
-Generate relevant tags for this news article. Consider:
-- Main topic/theme
-- Industry sector
-- Geographic relevance
-- Economic/political implications
-- Key concepts
-
-Title: {title}
-Category: {category}
-Content: {content[:400]}...
-
-Return a JSON object with a single key "tags" containing a list of 3-5 lowercase hyphenated tags (e.g., "supply-chain", "trade-war").
-"""
+            prompt = TAGS_PROMPT + f"\nTitle: {title}\nCategory: {category}\nContent: {content[:400]}...\n"
             
             response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+                model=ANALYSIS_MODEL,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.3,
                 response_format={"type": "json_object"}
             )
             
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(response.choices[0].message.content)
             return result.get("tags", [])[:5]
             
         except Exception as e:
@@ -134,32 +452,16 @@ Return a JSON object with a single key "tags" containing a list of 3-5 lowercase
     def _analyze_sentiment(self, title: str, content: str) -> str:
         """Analyze sentiment using GPT"""
         try:
-            prompt = f"""
-Analyze the sentiment of this news article. Consider:
-- Overall tone and language
-- Impact on stakeholders mentioned
-- Economic/social implications
-- Forward-looking statements
-
-Title: {title}
-Content: {content[:400]}...
-
-Return a JSON object with:
-- "sentiment": one of "positive", "negative", "neutral", "mixed"
-- "confidence": a number between 0 and 1
-- "reasoning": brief explanation (1-2 sentences)
-
-If the sentiment is clearly mixed, return "neutral".
-"""
+            prompt = SENTIMENT_PROMPT + f"\nTitle: {title}\nContent: {content[:400]}...\n"
             
             response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+                model=ANALYSIS_MODEL,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.3,
                 response_format={"type": "json_object"}
             )
             
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(response.choices[0].message.content)
             sentiment = result.get("sentiment", "neutral")
             
             # Normalize to our expected values
@@ -175,39 +477,16 @@ If the sentiment is clearly mixed, return "neutral".
     def _calculate_impact_score(self, title: str, content: str, category: str) -> float:
         """Calculate impact score using GPT"""
         try:
-            prompt = f"""
-Assess the potential impact of this news article on a scale of 1-10. Consider:
-- Market/economic implications
-- Number of people/organizations affected
-- Geographic scope (local/national/global)
-- Urgency and time sensitivity
-- Potential for cascading effects
-- Political/regulatory implications
-
-Title: {title}
-Category: {category}
-Content: {content[:400]}...
-
-Return a JSON object with:
-- "impact_score": a number between 1.0 and 10.0
-- "factors": list of 2-3 key impact factors
-- "reasoning": brief explanation (1-2 sentences)
-
-Guidelines:
-- 1-3: Low impact, local or minor news
-- 4-6: Moderate impact, regional or sector-specific
-- 7-8: High impact, national or cross-industry
-- 9-10: Critical impact, global or systemic consequences
-"""
+            prompt = IMPACT_PROMPT + f"\nTitle: {title}\nCategory: {category}\nContent: {content[:400]}...\n"
             
             response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+                model=ANALYSIS_MODEL,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.3,
                 response_format={"type": "json_object"}
             )
             
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(response.choices[0].message.content)
             score = float(result.get("impact_score", 5.0))
             
             # Ensure score is within bounds
@@ -217,51 +496,122 @@ Guidelines:
             raise RuntimeError(f"GPT impact scoring failed: {e}")
     
     
-    def _comprehensive_analysis_gpt(self, title: str, content: str, category: str) -> Dict[str, Any]:
-        """Perform comprehensive analysis in a single GPT call"""
+    def _comprehensive_analysis_prompt(self, 
+                                       title: str, 
+                                       content: str, 
+                                       category: str,
+                                       fields: Tuple[str, ...] = ANALYSIS_FIELDS) -> str:
+        """Build the prompt for the single-call analysis of the requested fields"""
+        return _analysis_prompt(fields) + f"\nTitle: {title}\nCategory: {category}\nContent: {_truncate_tokens(content, ANALYSIS_CONTENT_TOKENS)}...\n"
+    
+    def _parse_comprehensive_analysis(self, response_content: str) -> Dict[str, Any]:
+        """Validate and normalize a comprehensive analysis response"""
+        return self._normalize_analysis(orjson.loads(response_content))
+    
+    def _normalize_analysis(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Clamp a single article's analysis to the expected shape"""
+        # The strict schema guarantees the requested fields; lengths and range are not enforceable there
+        analysis = {}
+        if "entities" in result:
+            analysis["entities"] = result["entities"][:10]
+        if "tags" in result:
+            analysis["tags"] = result["tags"][:5]
+        if "sentiment" in result:
+            analysis["sentiment"] = result["sentiment"]
+        if "impact_score" in result:
+            analysis["impact_score"] = min(max(float(result["impact_score"]), 1.0), 10.0)
+        return analysis
+    
+    def _comprehensive_analysis_request(self, 
+                                        title: str, 
+                                        content: str, 
+                                        category: str,
+                                        fields: Tuple[str, ...] = ANALYSIS_FIELDS) -> Dict[str, Any]:
+        """Build the chat completion request body for the analysis of the requested fields"""
+        return {
+            "model": ANALYSIS_MODEL,
+            "messages": [{"role": "user", "content": self._comprehensive_analysis_prompt(title, content, category, fields)}],
+            "temperature": 0.3,
+            "response_format": _analysis_response_format(fields)
+        }
+    
+    def _analysis_cache_key(self, 
+                            title: str, 
+                            content: str, 
+                            category: str,
+                            fields: Tuple[str, ...] = ANALYSIS_FIELDS) -> str:
+        """Hash whitespace- and case-normalized article text for exact-match lookups"""
+        text = f"{ANALYSIS_MODEL}|{','.join(fields)}|{category}|{title}|{content[:1000]}"
+        normalized = " ".join(text.lower().split())
+        return "analysis_" + hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _get_cached_analysis(self, 
+                             title: str, 
+                             content: str, 
+                             category: str,
+                             fields: Tuple[str, ...] = ANALYSIS_FIELDS) -> Optional[Dict[str, Any]]:
+        """Return a stored analysis covering the requested fields, preferring a full one"""
+        if self.analysis_cache is None:
+            return None
+        for cached_fields in dict.fromkeys((ANALYSIS_FIELDS, fields)):
+            cached = self.analysis_cache.get(self._analysis_cache_key(title, content, category, cached_fields))
+            if cached is not None:
+                return cached
+        return None
+    
+    def _cache_analysis(self, title: str, content: str, category: str, analysis: Dict[str, Any]):
+        """Store an analysis under the set of fields it covers"""
+        if self.analysis_cache is not None:
+            fields = tuple(name for name in ANALYSIS_FIELDS if name in analysis)
+            self.analysis_cache.set(self._analysis_cache_key(title, content, category, fields), analysis)
+    
+    def _comprehensive_analysis_gpt(self, 
+                                    title: str, 
+                                    content: str, 
+                                    category: str,
+                                    fields: Tuple[str, ...] = ANALYSIS_FIELDS) -> Dict[str, Any]:
+        """Perform analysis of the requested fields in a single GPT call"""
+        cached = self._get_cached_analysis(title, content, category, fields)
+        if cached is not None:
+            return cached
+        
         try:
-            prompt = f"""
-Analyze this news article comprehensively. Provide:
-
-1. ENTITIES: Key named entities (people, organizations, locations, products/tech)
-2. TAGS: 3-5 relevant lowercase hyphenated tags
-3. SENTIMENT: "positive", "negative", or "neutral"
-4. IMPACT_SCORE: 1-10 based on market/economic/social implications
-
-Title: {title}
-Category: {category}
-Content: {content[:600]}...
-
-Return a JSON object with:
-{{
-    "entities": ["entity1", "entity2", ...],  // max 10
-    "tags": ["tag1", "tag2", ...],  // 3-5 tags
-    "sentiment": "positive/negative/neutral",
-    "impact_score": 7.5,  // 1.0-10.0
-    "analysis_summary": "Brief 1-2 sentence summary of the article's significance"
-}}
-"""
-            
             response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.3,
-                response_format={"type": "json_object"}
+                **self._comprehensive_analysis_request(title, content, category, fields)
             )
             
-            result = json.loads(response.choices[0].message.content)
+            analysis = self._parse_comprehensive_analysis(response.choices[0].message.content)
             
-            # Validate and normalize the results
-            return {
-                "entities": result.get("entities", [])[:10],
-                "tags": result.get("tags", [])[:5],
-                "sentiment": result.get("sentiment", "neutral"),
-                "impact_score": min(max(float(result.get("impact_score", 5.0)), 1.0), 10.0),
-                "summary": result.get("analysis_summary", "")
-            }
+        except Exception as e:
+            raise RuntimeError(f"GPT comprehensive analysis failed: {e}")
+        
+        self._cache_analysis(title, content, category, analysis)
+        return analysis
+    
+    async def _comprehensive_analysis_gpt_async(self, 
+                                                title: str, 
+                                                content: str, 
+                                                category: str,
+                                                semaphore: asyncio.Semaphore,
+                                                fields: Tuple[str, ...] = ANALYSIS_FIELDS) -> Dict[str, Any]:
+        """Perform analysis of the requested fields in a single non-blocking GPT call"""
+        cached = self._get_cached_analysis(title, content, category, fields)
+        if cached is not None:
+            return cached
+        
+        try:
+            async with semaphore:
+                response = await self.aclient.chat.completions.create(
+                    **self._comprehensive_analysis_request(title, content, category, fields)
+                )
+            
+            analysis = self._parse_comprehensive_analysis(response.choices[0].message.content)
             
         except Exception as e:
             raise RuntimeError(f"GPT comprehensive analysis failed: {e}")
+        
+        self._cache_analysis(title, content, category, analysis)
+        return analysis
     
     def ingest_article(self, 
                       title: str,
@@ -290,23 +640,49 @@ Return a JSON object with:
         Returns:
             NewsArticle object that was added
         """
+        # One GPT call covers every missing field; supplied fields are not re-analyzed
+        analysis = None
+        missing = _missing_fields({
+            "entities": entities, "tags": tags, "sentiment": sentiment, "impact_score": impact_score
+        })
+        if missing:
+            analysis = self._comprehensive_analysis_gpt(title, content, category, missing)
+        
+        article = self._create_article(
+            title, content, source, category, timestamp,
+            entities, tags, sentiment, impact_score, analysis
+        )
+        
+        # Save to file
+        self._save_articles([article])
+        
+        return article
+    
+    def _create_article(self,
+                        title: str,
+                        content: str,
+                        source: str,
+                        category: str,
+                        timestamp: Optional[str] = None,
+                        entities: Optional[List[str]] = None,
+                        tags: Optional[List[str]] = None,
+                        sentiment: Optional[str] = None,
+                        impact_score: Optional[float] = None,
+                        analysis: Optional[Dict[str, Any]] = None) -> NewsArticle:
+        """Create an article from provided fields and GPT analysis and add it to the list"""
         # Generate timestamp if not provided
         if timestamp is None:
             timestamp = datetime.now(timezone.utc).isoformat()
         
-        # Use batch analysis to get all fields at once for efficiency
-        if entities is None or tags is None or sentiment is None or impact_score is None:
-            analysis = self._comprehensive_analysis_gpt(title, content, category)
-            
-            # Use analysis results for any missing fields
-            if entities is None:
-                entities = analysis["entities"]
-            if tags is None:
-                tags = analysis["tags"]
-            if sentiment is None:
-                sentiment = analysis["sentiment"]
-            if impact_score is None:
-                impact_score = analysis["impact_score"]
+        # Use analysis results for any missing fields
+        if entities is None:
+            entities = analysis["entities"]
+        if tags is None:
+            tags = analysis["tags"]
+        if sentiment is None:
+            sentiment = analysis["sentiment"]
+        if impact_score is None:
+            impact_score = analysis["impact_score"]
         
         # Create article object
         article = NewsArticle(
@@ -324,49 +700,407 @@ Return a JSON object with:
         
         # Add to articles list
         self.articles["articles"].append(article.to_dict())
-        
-        # Save to file
-        self._save_articles()
+        position = len(self.articles["articles"]) - 1
+        self._index_article(position, self.articles["articles"][-1])
+        bisect.insort(self._by_timestamp, (timestamp, -position))
         
         return article
     
     def ingest_batch(self, articles: List[Dict[str, Any]]) -> List[NewsArticle]:
         """Ingest multiple articles at once"""
+        return self._loop.run_until_complete(self.ingest_batch_async(articles))
+    
+    async def ingest_batch_async(self, articles: List[Dict[str, Any]]) -> List[NewsArticle]:
+        """
+        Ingest multiple articles, running their GPT analyses concurrently
+        
+        Args:
+            articles: Keyword arguments for ingest_article, one dict per article
+            
+        Returns:
+            NewsArticle objects that were added, in input order
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_GPT_REQUESTS)
+        analyses: List[Optional[Dict[str, Any]]] = [None] * len(articles)
+        
+        # Serve cached analyses first; only the rest go to GPT
+        pending = []
+        for i, article_data in enumerate(articles):
+            missing = _missing_fields(article_data)
+            if not missing:
+                continue
+            cached = self._get_cached_analysis(
+                article_data["title"], article_data["content"], article_data["category"], missing
+            )
+            if cached is not None:
+                analyses[i] = cached
+            else:
+                pending.append(i)
+        
+        # Several articles share each request, packed up to the token budget
+        batches = self._pack_analysis_batches([articles[i] for i in pending])
+        batch_results = await asyncio.gather(*[
+            self._comprehensive_analysis_batch_gpt_async(
+                [articles[pending[k]] for k in batch], semaphore
+            )
+            for batch in batches
+        ], return_exceptions=True)
+        
+        # A failed request (after SDK retries) drops its articles, not the whole batch
+        failed = set()
+        for batch, results in zip(batches, batch_results):
+            if isinstance(results, Exception):
+                print(f"Warning: {results}; skipping {len(batch)} article(s)")
+                failed.update(pending[k] for k in batch)
+                continue
+            for k, analysis in zip(batch, results):
+                analyses[pending[k]] = analysis
+        
+        # Journal writes and compaction run off the event loop; the lock keeps other
+        # ingests on this loop from touching the store or journal meanwhile
+        async with self._store_lock():
+            ingested = [
+                self._create_article(**article_data, analysis=analysis)
+                for i, (article_data, analysis) in enumerate(zip(articles, analyses))
+                if i not in failed
+            ]
+            
+            # Journal the whole batch in one write
+            await asyncio.to_thread(self._append_to_journal, ingested)
+            self._journal_entries += len(ingested)
+            if self._journal_entries >= JOURNAL_COMPACTION_THRESHOLD:
+                # Readers run on this loop unlocked, so rebuild indexes here and only offload the write;
+                # the store lock keeps writers from touching the articles while it serializes
+                self._sort_store()
+                await asyncio.to_thread(self._write_snapshot)
+                self._journal_entries = 0
+        
+        return ingested
+    
+    def _store_lock(self) -> asyncio.Lock:
+        """Lock serializing store writes among the running loop's tasks"""
+        loop = asyncio.get_running_loop()
+        lock = self._store_locks.get(loop)
+        if lock is None:
+            lock = self._store_locks[loop] = asyncio.Lock()
+        return lock
+    
+    def _article_analysis_block(self, number: int, article_data: Dict[str, Any]) -> str:
+        """Format one numbered article for the multi-article analysis prompt"""
+        return (
+            f"\nArticle {number}\nTitle: {article_data['title']}\n"
+            f"Category: {article_data['category']}\nContent: {_truncate_tokens(article_data['content'], ANALYSIS_CONTENT_TOKENS)}...\n"
+        )
+    
+    def _pack_analysis_batches(self, articles: List[Dict[str, Any]]) -> List[List[int]]:
+        """Group article indices so each multi-article prompt stays within MAX_ANALYSIS_BATCH_TOKENS"""
+        encoding = _get_encoding()
+        budget = MAX_ANALYSIS_BATCH_TOKENS - len(encoding.encode(MULTI_ANALYSIS_PROMPT, disallowed_special=()))
+        
+        batches = []
+        current: List[int] = []
+        used = 0
+        for i, article_data in enumerate(articles):
+            tokens = len(encoding.encode(self._article_analysis_block(len(current) + 1, article_data), disallowed_special=()))
+            if current and used + tokens > budget:
+                batches.append(current)
+                current, used = [], 0
+            current.append(i)
+            used += tokens
+        if current:
+            batches.append(current)
+        
+        return batches
+    
+    async def _comprehensive_analysis_batch_gpt_async(self,
+                                                      articles: List[Dict[str, Any]],
+                                                      semaphore: asyncio.Semaphore) -> List[Dict[str, Any]]:
+        """Analyze several articles in one GPT call, returning analyses in input order"""
+        if len(articles) == 1:
+            article_data = articles[0]
+            return [await self._comprehensive_analysis_gpt_async(
+                article_data["title"], article_data["content"], article_data["category"],
+                semaphore, _missing_fields(article_data)
+            )]
+        
+        prompt = MULTI_ANALYSIS_PROMPT + "".join(
+            self._article_analysis_block(number, article_data)
+            for number, article_data in enumerate(articles, 1)
+        )
+        
+        try:
+            async with semaphore:
+                response = await self.aclient.chat.completions.create(
+                    model=ANALYSIS_MODEL,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=0.3,
+                    response_format=MULTI_ANALYSIS_RESPONSE_FORMAT
+                )
+            
+            results = orjson.loads(response.choices[0].message.content)["analyses"]
+            if len(results) != len(articles):
+                raise ValueError(f"expected {len(articles)} analyses, got {len(results)}")
+            analyses = [self._normalize_analysis(result) for result in results]
+            
+        except Exception as e:
+            raise RuntimeError(f"GPT batch analysis failed: {e}")
+        
+        for article_data, analysis in zip(articles, analyses):
+            self._cache_analysis(article_data["title"], article_data["content"], article_data["category"], analysis)
+        
+        return analyses
+    
+    def ingest_bulk_batched(self, articles: List[Dict[str, Any]]) -> List[NewsArticle]:
+        """
+        Ingest a large backlog of articles through the OpenAI Batch API
+        
+        Trades latency (results can take up to 24h) for half the cost and no
+        real-time rate-limit contention. Use ingest_batch for interactive loads.
+        
+        Args:
+            articles: Keyword arguments for ingest_article, one dict per article
+            
+        Returns:
+            NewsArticle objects that were added, in input order
+        """
+        # 1. One chat completion request per uncached article still missing fields
+        analyses: Dict[int, Dict[str, Any]] = {}
+        request_lines = []
+        for i, article_data in enumerate(articles):
+            missing = _missing_fields(article_data)
+            if not missing:
+                continue
+            cached = self._get_cached_analysis(
+                article_data["title"], article_data["content"], article_data["category"], missing
+            )
+            if cached is not None:
+                analyses[i] = cached
+                continue
+            request_lines.append(orjson.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._comprehensive_analysis_request(
+                    article_data["title"], article_data["content"], article_data["category"], missing
+                )
+            }))
+        
+        if request_lines:
+            batch_analyses = self._run_analysis_batch(b"\n".join(request_lines))
+            for i, analysis in batch_analyses.items():
+                article_data = articles[i]
+                self._cache_analysis(article_data["title"], article_data["content"], article_data["category"], analysis)
+            analyses.update(batch_analyses)
+        
         ingested = []
-        for article_data in articles:
-            article = self.ingest_article(**article_data)
-            ingested.append(article)
+        for i, article_data in enumerate(articles):
+            if _missing_fields(article_data) and i not in analyses:
+                print(f"Warning: No batch analysis for article {i} ({article_data['title']}), skipping")
+                continue
+            ingested.append(self._create_article(**article_data, analysis=analyses.get(i)))
+        
+        # Journal the whole backlog in one write
+        self._save_articles(ingested)
+        
         return ingested
     
-    def _save_articles(self):
-        """Save articles to JSON file"""
-        with open(self.news_file_path, 'w', encoding='utf-8') as f:
-            json.dump(self.articles, f, indent=2, ensure_ascii=False)
+    def _run_analysis_batch(self, requests_jsonl: bytes) -> Dict[int, Dict[str, Any]]:
+        """Submit a JSONL request file to the Batch API and wait for parsed results"""
+        # 2. Upload the request file
+        batch_file = self.client.files.create(
+            file=("analysis_batch.jsonl", requests_jsonl),
+            purpose="batch"
+        )
+        
+        # 3. Create the batch job
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(f"Submitted analysis batch {batch.id}")
+        
+        # 4. Poll with exponential backoff until the job settles
+        delay = BATCH_POLL_INITIAL_SECONDS
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(delay)
+            delay = min(delay * 2, BATCH_POLL_MAX_SECONDS)
+            batch = self.client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"GPT analysis batch {batch.id} ended with status {batch.status}")
+        
+        # 5. Map results back to article indices via custom_id
+        analyses = {}
+        output = self.client.files.content(batch.output_file_id).content
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            result = orjson.loads(line)
+            response = result.get("response") or {}
+            if result.get("error") or response.get("status_code") != 200:
+                logger.error(f"Batch request {result.get('custom_id')} failed: {result.get('error')}")
+                continue
+            try:
+                content = response["body"]["choices"][0]["message"]["content"]
+                analyses[int(result["custom_id"])] = self._parse_comprehensive_analysis(content)
+            except (KeyError, IndexError, ValueError, TypeError) as e:
+                logger.error(f"Malformed batch result {result.get('custom_id')}: {e}")
+        
+        return analyses
+    
+    def _save_articles(self, new_articles: List[NewsArticle]):
+        """Append newly ingested articles to the journal"""
+        self._append_to_journal(new_articles)
+        self._journal_entries += len(new_articles)
+        self._compact_if_due()
+    
+    def _append_to_journal(self, new_articles: List[NewsArticle]):
+        """Write articles to the journal file; touches no in-memory state, so safe to run in a thread"""
+        if not new_articles:
+            return
+        with open(self.journal_path, 'ab', buffering=WRITE_BUFFER_SIZE) as f:
+            for article in new_articles:
+                # orjson serializes dataclasses natively, no intermediate dict
+                f.write(orjson.dumps(article) + b"\n")
+    
+    def _compact_if_due(self):
+        """Fold the journal into the snapshot once it has grown past the threshold"""
+        if self._journal_entries >= JOURNAL_COMPACTION_THRESHOLD:
+            self.compact()
+    
+    def compact(self):
+        """Fold the journal into the JSON snapshot, sorted and deduplicated by ID"""
+        self._sort_store()
+        self._write_snapshot()
+        self._journal_entries = 0
+    
+    def _sort_store(self):
+        """Sort and deduplicate the in-memory articles by ID and rebuild their indexes"""
+        articles_by_id = {article["id"]: article for article in self.articles["articles"]}
+        self.articles["articles"] = [articles_by_id[article_id] for article_id in sorted(articles_by_id)]
+        self._build_search_index()
+        self._build_recency_index()
+    
+    def _write_snapshot(self):
+        """Write the snapshot and drop the journal it replaces; only reads the store, so safe to run in a thread"""
+        # Write to a temp file first so an interrupted compaction never loses the snapshot
+        tmp_path = self.news_file_path + ".tmp"
+        with open(tmp_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(orjson.dumps(self.articles, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, self.news_file_path)
+        
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+    
+    def _build_recency_index(self):
+        """Keep (timestamp, -position) pairs sorted so the newest articles sit at the end"""
+        self._by_timestamp = sorted(
+            (article["timestamp"], -position)
+            for position, article in enumerate(self.articles["articles"])
+        )
     
     def get_recent_articles(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get most recent articles"""
-        sorted_articles = sorted(
-            self.articles["articles"], 
-            key=lambda x: x["timestamp"], 
-            reverse=True
-        )
-        return sorted_articles[:limit]
+        articles = self.articles["articles"]
+        newest = self._by_timestamp[-limit:] if limit > 0 else []
+        return [articles[-neg_position] for _, neg_position in reversed(newest)]
+    
+    def _build_search_index(self):
+        """Build the token -> article positions inverted index used by search_articles"""
+        self._index: Dict[str, set] = {}
+        self._sorted_vocab: Optional[List[str]] = None
+        self._sorted_reversed_vocab: Optional[List[str]] = None
+        
+        for position, article in enumerate(self.articles["articles"]):
+            self._index_article(position, article)
+    
+    def _index_article(self, position: int, article: Dict[str, Any]):
+        """Add one article's title, content and entity tokens to the index"""
+        tokens = set(_TOKEN_RE.findall(article["title"].lower()))
+        tokens.update(_TOKEN_RE.findall(article["content"].lower()))
+        for entity in article.get("entities", []):
+            tokens.update(_TOKEN_RE.findall(entity.lower()))
+        
+        for token in tokens:
+            postings = self._index.get(token)
+            if postings is None:
+                postings = self._index[token] = set()
+                self._sorted_vocab = None
+                self._sorted_reversed_vocab = None
+            postings.add(position)
+    
+    def _tokens_with_prefix(self, prefix: str, reverse: bool = False) -> List[str]:
+        """Binary search the sorted vocabulary for tokens starting (or, reversed, ending) with prefix"""
+        if reverse:
+            if self._sorted_reversed_vocab is None:
+                self._sorted_reversed_vocab = sorted(token[::-1] for token in self._index)
+            vocab = self._sorted_reversed_vocab
+        else:
+            if self._sorted_vocab is None:
+                self._sorted_vocab = sorted(self._index)
+            vocab = self._sorted_vocab
+        
+        matches = []
+        for i in range(bisect.bisect_left(vocab, prefix), len(vocab)):
+            if not vocab[i].startswith(prefix):
+                break
+            matches.append(vocab[i][::-1] if reverse else vocab[i])
+        return matches
+    
+    def _candidate_positions(self, query_tokens: List[str]) -> set:
+        """
+        Positions of articles that can contain the query as a substring
+        
+        Inside a match the query's interior tokens are whole tokens of the text,
+        its first token ends a text token and its last token starts one; a
+        single-token query may sit anywhere inside a text token.
+        """
+        candidates = None
+        last = len(query_tokens) - 1
+        
+        for i, token in enumerate(query_tokens):
+            if last == 0:
+                vocab = [t for t in self._index if token in t]
+            elif i == 0:
+                vocab = self._tokens_with_prefix(token[::-1], reverse=True)
+            elif i == last:
+                vocab = self._tokens_with_prefix(token)
+            else:
+                vocab = [token] if token in self._index else []
+            
+            postings = set().union(*(self._index[t] for t in vocab))
+            candidates = postings if candidates is None else candidates & postings
+            if not candidates:
+                break
+        
+        return candidates
     
     def search_articles(self, query: str) -> List[Dict[str, Any]]:
         """Simple search through articles"""
         query_lower = query.lower()
-        results = []
+        query_tokens = _TOKEN_RE.findall(query_lower)
+        articles = self.articles["articles"]
+        
+        # Narrow down with the inverted index; queries without word characters scan everything
+        if query_tokens:
+            candidates = sorted(self._candidate_positions(query_tokens))
+        else:
+            candidates = range(len(articles))
         
-        for article in self.articles["articles"]:
+        results = []
+        for position in candidates:
+            article = articles[position]
+            # Short fields first so most hits never lowercase the full content
             if (query_lower in article["title"].lower() or 
-                query_lower in article["content"].lower() or
-                any(query_lower in entity.lower() for entity in article.get("entities", []))):
+                any(query_lower in entity.lower() for entity in article.get("entities", [])) or
+                query_lower in article["content"].lower()):
                 results.append(article)
         
         return results
 
 
-class NewsAPIConnector:
+class NewsAPIConnector(AsyncClientMixin):
     """Connector for external news APIs with GPT-powered category detection"""
     
     def __init__(self, api_key: Optional[str] = None):
@@ -377,64 +1111,110 @@ class NewsAPIConnector:
         if not openai_key:
             raise ValueError("OPENAI_API_KEY is required for NewsAPIConnector")
         
-        self.client = OpenAI(api_key=openai_key)
+        self.client = OpenAI(api_key=openai_key, timeout=API_TIMEOUT_SECONDS, max_retries=API_MAX_RETRIES)
+        self._init_async_clients(openai_key)
+        
+        # Wire services republish identical stories; categorize each one once
+        self._category_cache: Dict[str, str] = {}
+    
+    def _category_cache_key(self, title: str, content: str) -> str:
+        """Hash exactly the text the categorization prompt sees"""
+        return hashlib.blake2b(f"{title}|{content[:300]}".encode("utf-8"), digest_size=16).hexdigest()
     
     def _detect_category(self, title: str, content: str) -> str:
         """Detect category using GPT"""
+        cache_key = self._category_cache_key(title, content)
+        if cache_key in self._category_cache:
+            return self._category_cache[cache_key]
         
         try:
-            prompt = f"""
-Categorize this news article into one of these categories:
-- Politics
-- Finance  
-- Technology
-- Business
-- International
-- Environment
-- Labor
-- Legal
-- Energy
-- Healthcare
-- Sports
-- Entertainment
-- Science
-- Education
-- Real Estate
-- Transportation
-- Agriculture
-- Manufacturing
-- Defense
-- Commodities
-
-Title: {title}
-Content: {content[:300]}...
-
-Return a JSON object with:
-{{"category": "chosen category"}}
-"""
+            prompt = CATEGORY_PROMPT + f"\nTitle: {title}\nContent: {content[:300]}...\n"
             
             response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+                model=ANALYSIS_MODEL,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.2,
                 response_format={"type": "json_object"}
             )
             
-            result = json.loads(response.choices[0].message.content)
-            return result.get("category", "Business")
+            result = orjson.loads(response.choices[0].message.content)
+            category = result.get("category", "Business")
             
         except Exception as e:
             raise RuntimeError(f"GPT categorization failed: {e}")
+        
+        self._category_cache[cache_key] = category
+        return category
     
+    async def _detect_category_async(self, title: str, content: str, semaphore: asyncio.Semaphore) -> str:
+        """Detect category using a non-blocking GPT call"""
+        cache_key = self._category_cache_key(title, content)
+        if cache_key in self._category_cache:
+            return self._category_cache[cache_key]
+        
+        try:
+            prompt = CATEGORY_PROMPT + f"\nTitle: {title}\nContent: {content[:300]}...\n"
+            
+            async with semaphore:
+                response = await self.aclient.chat.completions.create(
+                    model=ANALYSIS_MODEL,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=0.2,
+                    response_format={"type": "json_object"}
+                )
+            
+            result = orjson.loads(response.choices[0].message.content)
+            category = result.get("category", "Business")
+            
+        except Exception as e:
+            raise RuntimeError(f"GPT categorization failed: {e}")
+        
+        self._category_cache[cache_key] = category
+        return category
     
-    def fetch_latest_news(self) -> List[Dict[str, Any]]:
+    async def _detect_categories_batch_async(self, 
+                                             stories: List[Tuple[str, str]], 
+                                             semaphore: asyncio.Semaphore) -> List[str]:
+        """Categorize several (title, content) stories in one GPT call, in input order"""
+        if len(stories) == 1:
+            return [await self._detect_category_async(*stories[0], semaphore)]
+        
+        prompt = MULTI_CATEGORY_PROMPT + "".join(
+            f"\nArticle {number}\nTitle: {title}\nContent: {content[:300]}...\n"
+            for number, (title, content) in enumerate(stories, 1)
+        )
+        
+        try:
+            async with semaphore:
+                response = await self.aclient.chat.completions.create(
+                    model=ANALYSIS_MODEL,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=0.2,
+                    response_format=MULTI_CATEGORY_RESPONSE_FORMAT
+                )
+            
+            categories = orjson.loads(response.choices[0].message.content)["categories"]
+            if len(categories) != len(stories):
+                raise ValueError(f"expected {len(stories)} categories, got {len(categories)}")
+            
+        except Exception as e:
+            print(f"Warning: Batch categorization failed ({e}), categorizing stories individually")
+            return list(await asyncio.gather(*[
+                self._detect_category_async(title, content, semaphore) for title, content in stories
+            ]))
+        
+        for (title, content), category in zip(stories, categories):
+            self._category_cache[self._category_cache_key(title, content)] = category
+        return categories
+    
+    def _fetch_raw_news(self) -> List[Dict[str, Any]]:
         """
         Fetch latest news from external API
         This is a placeholder - implement actual API integration
         """
         # Example structure for incoming news
         # In real implementation, this would fetch from NewsAPI, RSS feeds, etc.
-        sample_news = [
+        return [
             {
                 "title": "Breaking: Major Tech Company Announces AI Breakthrough",
                 "content": "Leading technology firm reveals groundbreaking artificial intelligence system that promises to revolutionize natural language processing...",
@@ -446,50 +1226,102 @@ Return a JSON object with:
                 "source": "Financial Times"
             }
         ]
+    
+    def fetch_latest_news(self) -> List[Dict[str, Any]]:
+        """Fetch latest news with categories (sync wrapper around fetch_latest_news_async)"""
+        return self._loop.run_until_complete(self.fetch_latest_news_async())
+    
+    async def fetch_latest_news_async(self) -> List[Dict[str, Any]]:
+        """Fetch latest news, detecting missing categories concurrently"""
+        processed_news = self._fetch_raw_news()
         
-        # Add categories to news items
-        processed_news = []
-        for item in sample_news:
+        # Add categories to news items, one request per distinct story
+        uncategorized: Dict[str, List[Dict[str, Any]]] = {}
+        for item in processed_news:
             if "category" not in item:
-                item["category"] = self._detect_category(item["title"], item["content"])
-            processed_news.append(item)
+                cache_key = self._category_cache_key(item["title"], item["content"])
+                uncategorized.setdefault(cache_key, []).append(item)
+        
+        # Only stories not seen before go to GPT, several per request
+        misses = [cache_key for cache_key in uncategorized if cache_key not in self._category_cache]
+        batches = [misses[i:i + CATEGORY_BATCH_SIZE] for i in range(0, len(misses), CATEGORY_BATCH_SIZE)]
+        
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_GPT_REQUESTS)
+        batch_categories = await asyncio.gather(*[
+            self._detect_categories_batch_async(
+                [(uncategorized[cache_key][0]["title"], uncategorized[cache_key][0]["content"]) for cache_key in batch],
+                semaphore
+            )
+            for batch in batches
+        ])
+        
+        categories = {cache_key: self._category_cache[cache_key] for cache_key in uncategorized if cache_key not in misses}
+        for batch, results in zip(batches, batch_categories):
+            categories.update(zip(batch, results))
+        
+        for cache_key, items in uncategorized.items():
+            for item in items:
+                item["category"] = categories[cache_key]
         
         return processed_news
 
 
-def monitor_and_ingest(ingestion_engine: NewsIngestionEngine, 
-                      api_connector: NewsAPIConnector,
-                      interval_seconds: int = 300):
+async def monitor_and_ingest(ingestion_engine: NewsIngestionEngine, 
+                             api_connector: NewsAPIConnector,
+                             interval_seconds: int = 300):
     """
     Monitor for new articles and automatically ingest them
     
+    Fetching and ingestion run as separate tasks joined by a bounded queue, so
+    the next poll is not held up by GPT analysis of the previous one.
+    Run with asyncio.run(monitor_and_ingest(...)); both engines open clients
+    for that loop and close them when monitoring stops.
+    
     Args:
         ingestion_engine: The ingestion engine instance
         api_connector: API connector for fetching news
         interval_seconds: How often to check for new articles
     """
-    import time
-    
     print(f"Starting news monitoring (checking every {interval_seconds} seconds)...")
     
-    while True:
-        try:
-            # Fetch latest news
-            new_articles = api_connector.fetch_latest_news()
-            
-            if new_articles:
-                print(f"Found {len(new_articles)} new articles")
-                ingested = ingestion_engine.ingest_batch(new_articles)
-                
-                for article in ingested:
-                    print(f"Ingested: {article.title} (ID: {article.id})")
+    queue: asyncio.Queue = asyncio.Queue(maxsize=MONITOR_QUEUE_SIZE)
+    
+    async def produce():
+        while True:
+            try:
+                # Fetch latest news
+                new_articles = await api_connector.fetch_latest_news_async()
+                if new_articles:
+                    print(f"Found {len(new_articles)} new articles")
+                    await queue.put(new_articles)
+            except Exception as e:
+                print(f"Error during fetch: {e}")
             
             # Wait before next check
-            time.sleep(interval_seconds)
+            await asyncio.sleep(interval_seconds)
+    
+    async def consume():
+        while True:
+            # Ingest everything that queued up since the last batch in one go
+            new_articles = await queue.get()
+            while not queue.empty():
+                new_articles = new_articles + queue.get_nowait()
             
-        except KeyboardInterrupt:
-            print("\nStopping news monitor...")
-            break
-        except Exception as e:
-            print(f"Error during ingestion: {e}")
-            time.sleep(interval_seconds)
\ No newline at end of file
+            try:
+                ingested = await ingestion_engine.ingest_batch_async(new_articles)
+                for article in ingested:
+                    print(f"Ingested: {article.title} (ID: {article.id})")
+            except Exception as e:
+                print(f"Error during ingestion: {e}")
+    
+    tasks = [asyncio.create_task(produce()), asyncio.create_task(consume())]
+    try:
+        await asyncio.gather(*tasks)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("\nStopping news monitor...")
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await ingestion_engine.aclose()
+        await api_connector.aclose()
@@ -3,28 +3,155 @@ Core Relationship Discovery Engine
 Discovers hidden cause-and-effect relationships between news articles
 """
 
-import json
+import time
+import asyncio
+import heapq
+import hashlib
 import logging
+from functools import lru_cache
 from typing import List, Dict, Any, Tuple, Optional
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
 import numpy as np
 from openai import OpenAI
 from sentence_transformers import SentenceTransformer
 import diskcache
+import orjson
+import tiktoken
 
 from .config import (
-    OPENAI_API_KEY, DEFAULT_MODEL, ADVANCED_MODEL,
-    RELATIONSHIP_TYPES, RELATIONSHIP_CONFIDENCE_THRESHOLD,
+    OPENAI_API_KEY, ADVANCED_MODEL, EMBEDDING_MODEL, EMBEDDING_BATCH_SIZE,
+    EMBEDDING_BACKEND, EMBEDDING_ONNX_FILE,
+    RELATIONSHIP_TYPES, IMPACT_LEVELS, RELATIONSHIP_CONFIDENCE_THRESHOLD,
     TEMPORAL_WINDOW_DAYS, SIMILARITY_THRESHOLD,
     MAX_RELATIONSHIPS_PER_ARTICLE, BATCH_SIZE_FOR_GPT,
-    ENABLE_FULL_SCAN, CACHE_DIR, CACHE_TTL_SECONDS
+    ENABLE_FULL_SCAN, MAX_GPT_CANDIDATES,
+    CACHE_DIR, CACHE_SHARDS, RELATIONSHIP_CACHE_TTL_SECONDS, RELATIONSHIP_MEMORY_CACHE_SIZE,
+    API_TIMEOUT_SECONDS, API_MAX_RETRIES, MAX_CONCURRENT_GPT_REQUESTS,
+    BULK_RELATIONSHIP_MIN_ARTICLES
 )
+from .news_ingestion import AsyncClientMixin, BATCH_POLL_INITIAL_SECONDS, BATCH_POLL_MAX_SECONDS
+from .storage import load_news_data
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Set bits per byte, for popcounts on numpy < 2.0 (no np.bitwise_count)
+_POPCOUNT_TABLE = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+
+# Sentinel for cache lookups, so a cached empty result still counts as a hit
+_CACHE_MISS = object()
+
+# Bump when the persisted relationship graph's layout changes
+GRAPH_CACHE_VERSION = 1
+
+# Outgoing edges followed per article when searching for chains
+CHAIN_BRANCHING = 10
+
+# Model for relationship analysis; supports strict structured outputs, unlike gpt-3.5-turbo
+RELATIONSHIP_MODEL = "gpt-4o-mini"
+
+# Article content sent in relationship prompts, in tokens (about the old 300/200-character excerpts)
+SOURCE_CONTENT_TOKENS = 75
+CANDIDATE_CONTENT_TOKENS = 50
+
+# Static prompt text, built once instead of per GPT batch
+RELATIONSHIP_TYPES_DESCRIPTION = "\n".join(
+    f"- {key}: {value['description']}" for key, value in RELATIONSHIP_TYPES.items()
+)
+
+BATCH_ANALYSIS_INSTRUCTIONS = f"""
+RELATIONSHIP TYPES:
+{RELATIONSHIP_TYPES_DESCRIPTION}
+
+CANDIDATE ARTICLES:
+"""
+
+# Structured outputs: the model can only emit known relationship types and impact levels
+RELATIONSHIP_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "target_id": {"type": "integer"},
+        "type": {"type": "string", "enum": list(RELATIONSHIP_TYPES)},
+        "confidence": {"type": "number"},
+        "explanation": {"type": "string"},
+        "impact_level": {"type": "string", "enum": list(IMPACT_LEVELS)}
+    },
+    "required": ["target_id", "type", "confidence", "explanation", "impact_level"],
+    "additionalProperties": False
+}
+
+RELATIONSHIPS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "RelationshipBatch",
+        "schema": {
+            "type": "object",
+            "properties": {"relationships": {"type": "array", "items": RELATIONSHIP_SCHEMA}},
+            "required": ["relationships"],
+            "additionalProperties": False
+        },
+        "strict": True
+    }
+}
+
+CLASSIFICATION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "RelationshipClassification",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "relationship_type": {"type": "string", "enum": list(RELATIONSHIP_TYPES)},
+                "confidence": {"type": "number"},
+                "explanation": {"type": "string"}
+            },
+            "required": ["relationship_type", "confidence", "explanation"],
+            "additionalProperties": False
+        },
+        "strict": True
+    }
+}
+
+
+def _popcount_rows(bits: np.ndarray) -> np.ndarray:
+    """Number of set bits in each row of a uint64 matrix"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bits).sum(axis=1, dtype=np.int64)
+    return _POPCOUNT_TABLE[bits.view(np.uint8)].sum(axis=1, dtype=np.int64)
+
+
+@lru_cache(maxsize=None)
+def _get_encoding():
+    """Load the tokenizer for the relationship model once, on first use"""
+    return tiktoken.encoding_for_model(RELATIONSHIP_MODEL)
+
+
+def _token_excerpts(text: str, *limits: int) -> Tuple[str, ...]:
+    """Leading excerpts of text cut at each token limit, from one tokenizer pass"""
+    # Tokens average a few characters, so a bounded prefix is always enough
+    prefix = text[:max(limits) * 8]
+    tokens = _get_encoding().encode(prefix, disallowed_special=())
+    return tuple(
+        prefix if len(tokens) <= limit else _get_encoding().decode(tokens[:limit])
+        for limit in limits
+    )
+
+
+@lru_cache(maxsize=None)
+def get_encoder() -> SentenceTransformer:
+    """Load the sentence encoder once per process (~90 MB) and share it between engines"""
+    if EMBEDDING_BACKEND == "onnx":
+        # Dynamically quantized int8 export (needs optimum[onnxruntime])
+        return SentenceTransformer(EMBEDDING_MODEL, backend="onnx", model_kwargs={"file_name": EMBEDDING_ONNX_FILE})
+    
+    encoder = SentenceTransformer(EMBEDDING_MODEL)
+    if encoder.device.type == "cuda":
+        encoder.half()  # FP16 halves memory traffic and runs on tensor cores
+    return encoder
+
 
 @dataclass
 class Relationship:
@@ -49,6 +176,23 @@ class Relationship:
         }
 
 
+@dataclass(slots=True)
+class Candidate:
+    """A scored candidate article; references the stored article instead of copying it"""
+    article: Dict[str, Any]
+    entity_overlap: float
+    embedding_similarity: float
+    temporal_distance: int
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **self.article,
+            'entity_overlap': self.entity_overlap,
+            'embedding_similarity': self.embedding_similarity,
+            'temporal_distance': self.temporal_distance
+        }
+
+
 @dataclass
 class RelationshipContext:
     """Context for relationship discovery"""
@@ -57,7 +201,7 @@ class RelationshipContext:
     time_window: timedelta
 
 
-class RelationshipDiscoveryEngine:
+class RelationshipDiscoveryEngine(AsyncClientMixin):
     """
     Discovers relationships between news articles using:
     1. Entity overlap detection
@@ -66,24 +210,32 @@ class RelationshipDiscoveryEngine:
     4. Pattern matching against known relationship types
     """
     
-    def __init__(self, news_data_path: str = "news.json"):
+    def __init__(self, 
+                 news_data_path: str = "news.json",
+                 embedding_model: Optional[SentenceTransformer] = None):
         """Initialize the relationship discovery engine"""
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-        self.cache = diskcache.Cache(CACHE_DIR) if CACHE_DIR else None
+        self.client = OpenAI(api_key=OPENAI_API_KEY, timeout=API_TIMEOUT_SECONDS, max_retries=API_MAX_RETRIES)
+        self._init_async_clients(OPENAI_API_KEY)
+        self.embedding_model = embedding_model or get_encoder()
+        self.cache = diskcache.FanoutCache(CACHE_DIR, shards=CACHE_SHARDS) if CACHE_DIR else None
+        # (article_id, max_relationships) -> relationships, most recently used last
+        self._relationship_memo: OrderedDict = OrderedDict()
         
         # Load news data
-        with open(news_data_path, 'r', encoding='utf-8') as f:
-            self.news_data = json.load(f)
+        self.news_data = load_news_data(news_data_path)
         self.articles = {article['id']: article for article in self.news_data['articles']}
         
-        # Pre-compute embeddings for all articles
-        self._compute_article_embeddings()
+        # Pre-compute embeddings, timestamps and entity sets for all articles
+        self._precompute_article_metadata()
+        
+        # Full relationship graph, built on first use
+        self._graph: Optional[Dict[int, List[Tuple[int, Relationship]]]] = None
+        self._chain_adjacency: Optional[Tuple[Dict[int, List[int]], Dict[int, List[int]]]] = None
         
         logger.info(f"Initialized RelationshipDiscoveryEngine with {len(self.articles)} articles")
     
-    def _compute_article_embeddings(self):
-        """Pre-compute embeddings for all articles"""
+    def _compute_article_embeddings(self) -> np.ndarray:
+        """Pre-compute embeddings for all articles, one row per article in dict order"""
         logger.info("Computing article embeddings...")
         
         # Create text representation for each article
@@ -92,14 +244,97 @@ class RelationshipDiscoveryEngine:
             text = f"{article['title']} {article['content'][:500]}"
             article_texts.append(text)
         
-        # Compute embeddings
-        embeddings = self.embedding_model.encode(article_texts)
-        
-        # Store embeddings with articles
-        for idx, article_id in enumerate(self.articles.keys()):
-            self.articles[article_id]['embedding'] = embeddings[idx]
+        # Reuse embeddings from an earlier run over the same corpus and encoder
+        digest = hashlib.sha256("\x00".join([EMBEDDING_MODEL, EMBEDDING_BACKEND, *article_texts]).encode('utf-8')).hexdigest()
+        cache_key = f"embeddings_{digest}"
+        embeddings = self.cache.get(cache_key) if self.cache else None
+        
+        if embeddings is None:
+            # encode() already length-sorts texts internally, so batches pad only to similar lengths
+            embeddings = self.embedding_model.encode(
+                article_texts,
+                batch_size=EMBEDDING_BATCH_SIZE,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+            if self.cache:
+                self.cache.set(cache_key, embeddings)
         
         logger.info("Computed embeddings for all articles")
+        return embeddings
+    
+    def _precompute_article_metadata(self):
+        """Parse and stack per-article features once so queries only do array lookups"""
+        self.article_ids = list(self.articles.keys())
+        self.article_index = {article_id: idx for idx, article_id in enumerate(self.article_ids)}
+        
+        # L2-normalized, contiguous float32 rows: similarity is a single GEMV
+        embeddings = np.array(self._compute_article_embeddings(), dtype=np.float32, order='C')
+        norms = np.sqrt(np.einsum('ij,ij->i', embeddings, embeddings))[:, None]
+        embeddings /= np.where(norms > 0, norms, 1)
+        self.embedding_matrix = embeddings
+        
+        # Integer microseconds keep day arithmetic identical to timedelta.days
+        self.timestamps_us = np.array([
+            self._timestamp_us(self.articles[article_id]['timestamp']) for article_id in self.article_ids
+        ], dtype=np.int64)
+        
+        # Time-ordered view so the temporal window is two binary searches, not a full scan
+        self._time_order = np.argsort(self.timestamps_us, kind='stable')
+        self._sorted_timestamps_us = self.timestamps_us[self._time_order]
+        
+        # Prompt text cut at token boundaries once; an article's candidate block is
+        # identical in every batch it appears in, so it is formatted once as well
+        self._source_excerpts = {}
+        self._candidate_summaries = {}
+        for article_id in self.article_ids:
+            article = self.articles[article_id]
+            source_excerpt, candidate_excerpt = _token_excerpts(
+                article['content'], SOURCE_CONTENT_TOKENS, CANDIDATE_CONTENT_TOKENS
+            )
+            self._source_excerpts[article_id] = source_excerpt
+            self._candidate_summaries[article_id] = self._candidate_summary(article, candidate_excerpt)
+        
+        self.entity_sets = [
+            frozenset(self.articles[article_id].get('entities', [])) for article_id in self.article_ids
+        ]
+        
+        # Entity sets as packed bitsets over the corpus vocabulary: overlap is AND + popcount
+        self.entity_vocabulary = {entity: bit for bit, entity in enumerate(sorted(set().union(*self.entity_sets)))}
+        vocabulary = self.entity_vocabulary
+        rows = np.repeat(np.arange(len(self.entity_sets)), [len(entities) for entities in self.entity_sets])
+        bits = np.fromiter(
+            (vocabulary[entity] for entities in self.entity_sets for entity in entities),
+            dtype=np.int64, count=len(rows)
+        )
+        self.entity_bits = np.zeros((len(self.entity_sets), max(1, -(-len(vocabulary) // 64))), dtype=np.uint64)
+        np.bitwise_or.at(self.entity_bits, (rows, bits // 64), np.left_shift(np.uint64(1), (bits % 64).astype(np.uint64)))
+    
+    @staticmethod
+    def _timestamp_us(timestamp: str) -> int:
+        """Microseconds since the epoch for an ISO timestamp"""
+        parsed = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        epoch = datetime(1970, 1, 1, tzinfo=timezone.utc if parsed.tzinfo else None)
+        return (parsed - epoch) // timedelta(microseconds=1)
+    
+    def article_embedding(self, article_id: Optional[int]) -> Optional[np.ndarray]:
+        """Normalized embedding row for a loaded article, or None if it is not in the corpus"""
+        idx = self.article_index.get(article_id)
+        return None if idx is None else self.embedding_matrix[idx]
+    
+    def shared_entity_counts(self, entities) -> np.ndarray:
+        """Number of the given entities mentioned by each article, in article order"""
+        bits = np.array([self.entity_vocabulary[entity] for entity in set(entities) if entity in self.entity_vocabulary], dtype=np.int64)
+        query = np.zeros(self.entity_bits.shape[1], dtype=np.uint64)
+        np.bitwise_or.at(query, bits // 64, np.left_shift(np.uint64(1), (bits % 64).astype(np.uint64)))
+        return _popcount_rows(self.entity_bits & query)
+    
+    def temporal_gap_days(self, source_id: int, target_id: int) -> int:
+        """Whole days from source to target article, floored like timedelta.days"""
+        gap_us = (self.timestamps_us[self.article_index[target_id]] - 
+                  self.timestamps_us[self.article_index[source_id]])
+        return int(gap_us // 86_400_000_000)
     
     def discover_relationships(self, 
                              article_id: int, 
@@ -114,6 +349,135 @@ class RelationshipDiscoveryEngine:
         Returns:
             List of discovered relationships
         """
+        return self._loop.run_until_complete(self.discover_relationships_async(article_id, max_relationships))
+    
+    def discover_relationships_many(self, 
+                                  article_ids: List[int], 
+                                  max_relationships: Optional[int] = None,
+                                  allow_bulk: bool = False) -> Dict[int, List[Relationship]]:
+        """
+        Discover relationships for several articles concurrently, keyed by article ID
+        
+        With allow_bulk, large requests go through the Batch API, which can take
+        up to 24 hours; only warm_relationship_cache opts in.
+        """
+        if allow_bulk and len(article_ids) > BULK_RELATIONSHIP_MIN_ARTICLES:
+            return self.discover_relationships_bulk(article_ids, max_relationships)
+        return self._loop.run_until_complete(self._discover_relationships_many_async(article_ids, max_relationships))
+    
+    def discover_relationships_bulk(self, 
+                                  article_ids: List[int], 
+                                  max_relationships: Optional[int] = None) -> Dict[int, List[Relationship]]:
+        """
+        Discover relationships for many articles through the OpenAI Batch API
+        
+        Trades latency (results can take up to 24h) for half the cost and no
+        real-time rate-limit contention. Every candidate batch is submitted, since
+        there is no early stop offline.
+        
+        Args:
+            article_ids: IDs of the articles to analyze
+            max_relationships: Maximum number of relationships per article
+            
+        Returns:
+            Discovered relationships keyed by article ID
+        """
+        max_rels = max_relationships or MAX_RELATIONSHIPS_PER_ARTICLE
+        results: Dict[int, List[Relationship]] = {}
+        pending: Dict[int, List[Relationship]] = {}
+        request_lines = []
+        
+        # 1. One chat completion request per (source, candidate batch) for uncached articles
+        for article_id in article_ids:
+            if article_id not in self.articles:
+                raise ValueError(f"Article {article_id} not found")
+            source_article = self.articles[article_id]
+            
+            cached = self._cached_relationships(article_id, max_rels)
+            if cached is not None:
+                results[article_id] = cached
+                continue
+            
+            pending[article_id] = []
+            scored = self._score_candidates(source_article)
+            for i in range(0, len(scored[0]), BATCH_SIZE_FOR_GPT):
+                batch = self._materialize_candidates(*(column[i:i + BATCH_SIZE_FOR_GPT] for column in scored))
+                request_lines.append(orjson.dumps({
+                    "custom_id": f"{article_id}:{i}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._relationship_request(source_article, batch)
+                }))
+        
+        if request_lines:
+            for custom_id, content in self._run_relationship_batch(b"\n".join(request_lines)).items():
+                article_id = int(custom_id.split(':')[0])
+                pending[article_id].extend(self._parse_relationships(self.articles[article_id], content))
+        
+        # Sort, limit and cache exactly like the interactive path
+        for article_id, relationships in pending.items():
+            results[article_id] = heapq.nlargest(max_rels, relationships, key=lambda r: r.confidence)
+            self._store_relationships(article_id, max_rels, results[article_id])
+        
+        logger.info(f"Discovered relationships for {len(pending)} articles via the Batch API")
+        return {article_id: results[article_id] for article_id in article_ids}
+    
+    def _run_relationship_batch(self, requests_jsonl: bytes) -> Dict[str, str]:
+        """Submit a JSONL request file to the Batch API and return response contents by custom_id"""
+        batch_file = self.client.files.create(
+            file=("relationship_batch.jsonl", requests_jsonl),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(f"Submitted relationship batch {batch.id}")
+        
+        # Poll with exponential backoff until the job settles
+        delay = BATCH_POLL_INITIAL_SECONDS
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(delay)
+            delay = min(delay * 2, BATCH_POLL_MAX_SECONDS)
+            batch = self.client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"Relationship batch {batch.id} ended with status {batch.status}")
+        
+        contents = {}
+        output = self.client.files.content(batch.output_file_id).content
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            result = orjson.loads(line)
+            response = result.get('response') or {}
+            if result.get('error') or response.get('status_code') != 200:
+                logger.error(f"Batch request {result.get('custom_id')} failed: {result.get('error')}")
+                continue
+            try:
+                contents[result['custom_id']] = response['body']['choices'][0]['message']['content']
+            except (KeyError, IndexError, TypeError) as e:
+                logger.error(f"Malformed batch result {result.get('custom_id')}: {e}")
+        
+        return contents
+    
+    async def _discover_relationships_many_async(self, 
+                                                 article_ids: List[int], 
+                                                 max_relationships: Optional[int] = None) -> Dict[int, List[Relationship]]:
+        """Share one request semaphore across every article's GPT batches"""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_GPT_REQUESTS)
+        results = await asyncio.gather(*[
+            self.discover_relationships_async(article_id, max_relationships, semaphore)
+            for article_id in article_ids
+        ])
+        return dict(zip(article_ids, results))
+    
+    async def discover_relationships_async(self, 
+                                           article_id: int, 
+                                           max_relationships: Optional[int] = None,
+                                           semaphore: Optional[asyncio.Semaphore] = None) -> List[Relationship]:
+        """Discover relationships for an article, running its GPT batches concurrently"""
         if article_id not in self.articles:
             raise ValueError(f"Article {article_id} not found")
         
@@ -121,108 +485,173 @@ class RelationshipDiscoveryEngine:
         max_rels = max_relationships or MAX_RELATIONSHIPS_PER_ARTICLE
         
         # Check cache first
-        cache_key = f"relationships_{article_id}_{max_rels}"
-        if self.cache and cache_key in self.cache:
+        cached = self._cached_relationships(article_id, max_rels)
+        if cached is not None:
             logger.info(f"Returning cached relationships for article {article_id}")
-            return [Relationship(**r) for r in self.cache[cache_key]]
+            return cached
         
-        # Find candidate articles
-        candidates = self._find_candidate_articles(source_article)
-        logger.info(f"Found {len(candidates)} candidate articles for relationship analysis")
+        # Score candidates as arrays; Candidate views are only built for batches sent to GPT
+        scored = self._score_candidates(source_article)
+        logger.info(f"Found {len(scored[0])} candidate articles for relationship analysis")
         
         # Discover relationships
         relationships = []
-        
-        # Process in batches for efficiency
-        for i in range(0, len(candidates), BATCH_SIZE_FOR_GPT):
-            batch = candidates[i:i + BATCH_SIZE_FOR_GPT]
-            batch_relationships = self._analyze_relationships_batch(source_article, batch)
-            relationships.extend(batch_relationships)
+        semaphore = semaphore or asyncio.Semaphore(MAX_CONCURRENT_GPT_REQUESTS)
+        batch_starts = range(0, len(scored[0]), BATCH_SIZE_FOR_GPT)
+        
+        # Send batches in concurrent waves, most relevant first; stop once a wave yields enough.
+        # A wave holds just enough batches to reach max_rels if every candidate matched,
+        # so small requests stop after the first batch as the sequential loop did
+        wave_size = min(-(-max_rels // BATCH_SIZE_FOR_GPT), MAX_CONCURRENT_GPT_REQUESTS)
+        for wave in range(0, len(batch_starts), wave_size):
+            wave_results = await asyncio.gather(*[
+                self._analyze_relationships_batch(
+                    source_article,
+                    self._materialize_candidates(*(column[i:i + BATCH_SIZE_FOR_GPT] for column in scored)),
+                    semaphore
+                )
+                for i in batch_starts[wave:wave + wave_size]
+            ])
+            for batch_relationships in wave_results:
+                relationships.extend(batch_relationships)
             
             # Stop if we have enough relationships
             if len(relationships) >= max_rels:
                 break
         
-        # Sort by confidence and limit
-        relationships.sort(key=lambda r: r.confidence, reverse=True)
-        relationships = relationships[:max_rels]
+        # Keep the most confident, in descending order
+        relationships = heapq.nlargest(max_rels, relationships, key=lambda r: r.confidence)
         
         # Cache results
-        if self.cache:
-            self.cache.set(
-                cache_key, 
-                [r.to_dict() for r in relationships],
-                expire=CACHE_TTL_SECONDS
-            )
+        self._store_relationships(article_id, max_rels, relationships)
         
         logger.info(f"Discovered {len(relationships)} relationships for article {article_id}")
         return relationships
     
-    def _find_candidate_articles(self, source_article: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Find candidate articles that might be related"""
-        candidates = []
-        source_timestamp = datetime.fromisoformat(source_article['timestamp'].replace('Z', '+00:00'))
-        
-        for article in self.articles.values():
-            if article['id'] == source_article['id']:
-                continue
-            
-            # Temporal filter
-            article_timestamp = datetime.fromisoformat(article['timestamp'].replace('Z', '+00:00'))
-            time_diff = abs((article_timestamp - source_timestamp).days)
-            
-            if time_diff > TEMPORAL_WINDOW_DAYS:
-                continue
-            
-            # Entity overlap filter
-            source_entities = set(source_article.get('entities', []))
-            article_entities = set(article.get('entities', []))
-            entity_overlap = len(source_entities & article_entities) / max(len(source_entities), 1)
-            
-            # Embedding similarity
-            if 'embedding' in source_article and 'embedding' in article:
-                similarity = np.dot(source_article['embedding'], article['embedding'])
-                similarity = float(similarity)
-            else:
-                similarity = 0
+    def _cached_relationships(self, article_id: int, max_rels: int) -> Optional[List[Relationship]]:
+        """Look up relationships in the in-memory LRU, then the disk cache"""
+        memo_key = (article_id, max_rels)
+        if memo_key in self._relationship_memo:
+            self._relationship_memo.move_to_end(memo_key)
+            return list(self._relationship_memo[memo_key])
+        
+        if not self.cache:
+            return None
+        
+        # The key hashes the article content and model so results persist
+        # across runs but never outlive an edit or model change
+        cache_key = f"relationships_{self._article_digest(self.articles[article_id])}_{max_rels}"
+        cached = self.cache.get(cache_key, default=_CACHE_MISS)
+        if cached is _CACHE_MISS:
+            return None
+        
+        relationships = [Relationship(**r) for r in cached]
+        self._remember_relationships(memo_key, relationships)
+        return list(relationships)
+    
+    def _store_relationships(self, article_id: int, max_rels: int, relationships: List[Relationship]):
+        """Write relationships to both cache tiers"""
+        self._remember_relationships((article_id, max_rels), relationships)
+        if self.cache:
+            self.cache.set(
+                f"relationships_{self._article_digest(self.articles[article_id])}_{max_rels}",
+                [asdict(r) for r in relationships],
+                expire=RELATIONSHIP_CACHE_TTL_SECONDS
+            )
+    
+    def _remember_relationships(self, memo_key: Tuple[int, int], relationships: List[Relationship]):
+        """Insert into the in-memory LRU, evicting the least recently used entry when full"""
+        self._relationship_memo[memo_key] = list(relationships)
+        self._relationship_memo.move_to_end(memo_key)
+        if len(self._relationship_memo) > RELATIONSHIP_MEMORY_CACHE_SIZE:
+            self._relationship_memo.popitem(last=False)
+    
+    def _article_digest(self, article: Dict[str, Any]) -> str:
+        """Hash the inputs that determine an article's discovered relationships"""
+        payload = f"{article['id']}|{RELATIONSHIP_MODEL}|{article['title']}|{article['content']}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def _score_candidates(self, source_article: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Rank candidate positions for the source; returns positions and their aligned scores"""
+        source_idx = self.article_index[source_article['id']]
+        source_us = self.timestamps_us[source_idx]
+        
+        # Temporal filter (whole days, floored like timedelta.days): only the window is scored.
+        # floor(delta / day) in [-W, W]  <=>  -W days <= delta < (W + 1) days
+        lo = np.searchsorted(self._sorted_timestamps_us, source_us - TEMPORAL_WINDOW_DAYS * 86_400_000_000, side='left')
+        hi = np.searchsorted(self._sorted_timestamps_us, source_us + (TEMPORAL_WINDOW_DAYS + 1) * 86_400_000_000, side='left')
+        positions = np.sort(self._time_order[lo:hi])  # back to article order for stable tie-breaks
+        positions = positions[positions != source_idx]
+        time_diff = np.abs((self.timestamps_us[positions] - source_us) // 86_400_000_000)
+        
+        # Entity overlap: AND the window's entity bitsets with the source's and count shared bits
+        shared_entities = _popcount_rows(self.entity_bits[positions] & self.entity_bits[source_idx])
+        entity_overlap = shared_entities / max(len(self.entity_sets[source_idx]), 1)
+        
+        # Embedding similarity for in-window rows only
+        similarity = (self.embedding_matrix[positions] @ self.embedding_matrix[source_idx]).astype(np.float64)
+        
+        # Include if there's entity overlap, high similarity, or full scan is enabled
+        if not ENABLE_FULL_SCAN:
+            keep = (entity_overlap > 0) | (similarity > SIMILARITY_THRESHOLD)
+            positions, time_diff = positions[keep], time_diff[keep]
+            entity_overlap, similarity = entity_overlap[keep], similarity[keep]
+        
+        # Sort by relevance (entity overlap + embedding similarity); stable keeps article order on ties
+        order = np.argsort(-(entity_overlap + similarity), kind='stable')
+        
+        # Optional coarse filter before the expensive GPT rerank; off by default since it trades recall
+        if MAX_GPT_CANDIDATES is not None:
+            order = order[:MAX_GPT_CANDIDATES]
+        
+        return positions[order], entity_overlap[order], similarity[order], time_diff[order]
+    
+    def _materialize_candidates(self,
+                                positions: np.ndarray,
+                                entity_overlap: np.ndarray,
+                                similarity: np.ndarray,
+                                time_diff: np.ndarray) -> List[Candidate]:
+        """Build candidates for ranked positions and their aligned scores"""
+        return [
+            Candidate(self.articles[self.article_ids[idx]], float(overlap), float(sim), int(days))
+            for idx, overlap, sim, days in zip(positions, entity_overlap, similarity, time_diff)
+        ]
+    
+    async def _analyze_relationships_batch(self, 
+                                         source_article: Dict[str, Any], 
+                                         candidate_articles: List[Candidate],
+                                         semaphore: asyncio.Semaphore) -> List[Relationship]:
+        """Analyze relationships for a batch of candidate articles using GPT"""
+        try:
+            async with semaphore:
+                response = await self.aclient.chat.completions.create(
+                    **self._relationship_request(source_article, candidate_articles)
+                )
             
-            # Include if there's entity overlap, high similarity, or full scan is enabled
-            if entity_overlap > 0 or similarity > SIMILARITY_THRESHOLD or ENABLE_FULL_SCAN:
-                candidates.append({
-                    **article,
-                    'entity_overlap': entity_overlap,
-                    'embedding_similarity': similarity,
-                    'temporal_distance': time_diff
-                })
-        
-        # Sort by relevance (entity overlap + embedding similarity)
-        candidates.sort(
-            key=lambda x: x['entity_overlap'] + x['embedding_similarity'], 
-            reverse=True
-        )
+            return self._parse_relationships(source_article, response.choices[0].message.content)
         
-        return candidates
+        except Exception as e:
+            logger.error(f"Error in batch relationship analysis: {e}")
+            return []
     
-    def _analyze_relationships_batch(self, 
-                                   source_article: Dict[str, Any], 
-                                   candidate_articles: List[Dict[str, Any]]) -> List[Relationship]:
-        """Analyze relationships for a batch of candidate articles using GPT"""
+    def _relationship_request(self, 
+                              source_article: Dict[str, Any], 
+                              candidate_articles: List[Candidate]) -> Dict[str, Any]:
+        """Chat completion parameters for one batch; shared by the live and Batch API paths"""
+        return {
+            "model": RELATIONSHIP_MODEL,
+            "messages": [{"role": "user", "content": self._create_batch_analysis_prompt(source_article, candidate_articles)}],
+            "temperature": 0.3,
+            "response_format": RELATIONSHIPS_RESPONSE_FORMAT
+        }
+    
+    def _parse_relationships(self, source_article: Dict[str, Any], content: str) -> List[Relationship]:
+        """Parse a batch analysis response into relationships above the confidence threshold"""
         relationships = []
         
-        # Prepare batch prompt
-        prompt = self._create_batch_analysis_prompt(source_article, candidate_articles)
-        
         try:
-            response = self.client.chat.completions.create(
-                model=DEFAULT_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.3,
-                response_format={"type": "json_object"}
-            )
-            
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(content)
             
-            # Parse relationships from response
             for rel_data in result.get('relationships', []):
                 if rel_data['confidence'] >= RELATIONSHIP_CONFIDENCE_THRESHOLD:
                     relationship = Relationship(
@@ -236,32 +665,28 @@ class RelationshipDiscoveryEngine:
                     relationships.append(relationship)
         
         except Exception as e:
-            logger.error(f"Error in batch relationship analysis: {e}")
+            logger.error(f"Error parsing batch relationship analysis: {e}")
         
         return relationships
     
+    @staticmethod
+    def _candidate_summary(article: Dict[str, Any], content_excerpt: str) -> str:
+        """Format one candidate's block of the batch analysis prompt"""
+        return f"""
+Article {article['id']}:
+Title: {article['title']}
+Category: {article['category']}
+Entities: {', '.join(article.get('entities', [])[:5])}
+Content: {content_excerpt}...
+"""
+    
     def _create_batch_analysis_prompt(self, 
                                     source_article: Dict[str, Any], 
-                                    candidates: List[Dict[str, Any]]) -> str:
+                                    candidates: List[Candidate]) -> str:
         """Create prompt for batch relationship analysis"""
         
-        # Build relationship type descriptions
-        rel_types_desc = "\n".join([
-            f"- {key}: {value['description']}"
-            for key, value in RELATIONSHIP_TYPES.items()
-        ])
-        
-        # Build candidate summaries
-        candidate_summaries = []
-        for idx, candidate in enumerate(candidates):
-            summary = f"""
-Article {candidate['id']}:
-Title: {candidate['title']}
-Category: {candidate['category']}
-Entities: {', '.join(candidate.get('entities', [])[:5])}
-Content: {candidate['content'][:200]}...
-"""
-            candidate_summaries.append(summary)
+        # Candidate summaries are preformatted per article
+        candidate_summaries = [self._candidate_summaries[candidate.article['id']] for candidate in candidates]
         
         prompt = f"""
 Analyze the relationships between the source article and candidate articles.
@@ -271,13 +696,8 @@ ID: {source_article['id']}
 Title: {source_article['title']}
 Category: {source_article['category']}
 Entities: {', '.join(source_article.get('entities', []))}
-Content: {source_article['content'][:300]}...
-
-RELATIONSHIP TYPES:
-{rel_types_desc}
-
-CANDIDATE ARTICLES:
-{chr(10).join(candidate_summaries)}
+Content: {self._source_excerpts[source_article['id']]}...
+{BATCH_ANALYSIS_INSTRUCTIONS}{chr(10).join(candidate_summaries)}
 
 For each candidate article, determine:
 1. If there's a meaningful relationship with the source article
@@ -322,44 +742,106 @@ Only include relationships with confidence >= 0.6.
         Returns:
             List of paths (each path is a list of article IDs)
         """
-        # Build relationship graph
-        graph = self._build_relationship_graph()
+        if start_article_id == end_article_id:
+            return [[start_article_id]]
         
-        # Find paths using BFS
-        paths = []
-        queue = [(start_article_id, [start_article_id])]
-        visited = set()
+        forward_adjacency, reverse_adjacency = self._get_chain_adjacency()
+        max_edges = max_depth - 1
         
-        while queue and len(paths) < 5:  # Limit to 5 paths
-            current_id, path = queue.pop(0)
-            
-            if len(path) > max_depth:
-                continue
-            
-            if current_id == end_article_id:
-                paths.append(path)
-                continue
-            
-            if current_id in visited:
-                continue
-            visited.add(current_id)
-            
-            # Get relationships from current article
-            relationships = self.discover_relationships(current_id, max_relationships=10)
+        # Bidirectional search: simple half-paths out of the start and (reversed) into the end
+        forward = self._chain_layers(start_article_id, forward_adjacency, (max_edges + 1) // 2)
+        backward = self._chain_layers(end_article_id, reverse_adjacency, max_edges // 2)
+        
+        # Join halves at a shared node, shortest chains first
+        paths = []
+        for length in range(1, max_edges + 1):
+            forward_edges = (length + 1) // 2
+            meeting: Dict[int, List[Tuple[int, ...]]] = {}
+            for tail in backward[length - forward_edges]:
+                meeting.setdefault(tail[-1], []).append(tail)
             
-            for rel in relationships:
-                if rel.target_id not in path:  # Avoid cycles
-                    queue.append((rel.target_id, path + [rel.target_id]))
+            for head in forward[forward_edges]:
+                for tail in meeting.get(head[-1], []):
+                    if set(head).isdisjoint(tail[:-1]):  # Avoid cycles
+                        paths.append(list(head) + list(reversed(tail[:-1])))
+                        if len(paths) == 5:  # Limit to 5 paths
+                            return paths
         
         return paths
     
+    @staticmethod
+    def _chain_layers(origin: int, 
+                      adjacency: Dict[int, List[int]], 
+                      max_edges: int) -> List[List[Tuple[int, ...]]]:
+        """Simple paths from origin grouped by edge count, in BFS order"""
+        layers = [[(origin,)]]
+        for _ in range(max_edges):
+            layers.append([
+                path + (next_id,)
+                for path in layers[-1]
+                for next_id in adjacency.get(path[-1], [])
+                if next_id not in path
+            ])
+        return layers
+    
+    def warm_relationship_cache(self) -> Dict[int, List[Tuple[int, Relationship]]]:
+        """
+        Build the relationship graph offline, through the Batch API for large corpora
+        
+        Blocks until the batch settles, which can take up to 24 hours. Run it from a
+        scheduled job so interactive chain queries find every article cached.
+        """
+        self.discover_relationships_many(list(self.articles.keys()), allow_bulk=True)
+        return self._get_graph()
+    
+    def _get_chain_adjacency(self) -> Tuple[Dict[int, List[int]], Dict[int, List[int]]]:
+        """Forward and reverse adjacency over each article's strongest edges, built once"""
+        if self._chain_adjacency is None:
+            # Adjacency lists are sorted by confidence
+            forward = {
+                article_id: [target_id for target_id, _ in edges[:CHAIN_BRANCHING]]
+                for article_id, edges in self._get_graph().items()
+            }
+            reverse: Dict[int, List[int]] = {}
+            for article_id, targets in forward.items():
+                for target_id in targets:
+                    reverse.setdefault(target_id, []).append(article_id)
+            self._chain_adjacency = (forward, reverse)
+        return self._chain_adjacency
+    
+    def _get_graph(self) -> Dict[int, List[Tuple[int, Relationship]]]:
+        """Relationship graph for the loaded articles, memoized and persisted in the cache"""
+        if self._graph is not None:
+            return self._graph
+        
+        # Keyed on every article's digest so any edit or model change rebuilds it
+        digests = sorted(self._article_digest(article) for article in self.articles.values())
+        cache_key = f"graph_v{GRAPH_CACHE_VERSION}_{hashlib.sha256('|'.join(digests).encode('utf-8')).hexdigest()}"
+        
+        cached = self.cache.get(cache_key, default=_CACHE_MISS) if self.cache else _CACHE_MISS
+        if cached is not _CACHE_MISS:
+            self._graph = {
+                article_id: [(r['target_id'], Relationship(**r)) for r in edges]
+                for article_id, edges in cached.items()
+            }
+            return self._graph
+        
+        self._graph = self._build_relationship_graph()
+        if self.cache:
+            self.cache.set(
+                cache_key,
+                {article_id: [asdict(rel) for _, rel in edges] for article_id, edges in self._graph.items()},
+                expire=RELATIONSHIP_CACHE_TTL_SECONDS
+            )
+        return self._graph
+    
     def _build_relationship_graph(self) -> Dict[int, List[Tuple[int, Relationship]]]:
         """Build a graph of all relationships"""
         graph = {}
         
-        # Discover relationships for all articles
-        for article_id in self.articles.keys():
-            relationships = self.discover_relationships(article_id)
+        # Discover relationships for all articles concurrently
+        all_relationships = self.discover_relationships_many(list(self.articles.keys()))
+        for article_id, relationships in all_relationships.items():
             graph[article_id] = [(rel.target_id, rel) for rel in relationships]
         
         return graph
@@ -385,7 +867,7 @@ Title: {target_article['title']}
 Content: {target_article['content'][:400]}...
 
 RELATIONSHIP TYPES:
-{chr(10).join([f"- {k}: {v['description']}" for k, v in RELATIONSHIP_TYPES.items()])}
+{RELATIONSHIP_TYPES_DESCRIPTION}
 
 Determine:
 1. The most appropriate relationship type from Article 1 to Article 2
@@ -402,13 +884,13 @@ Return JSON:
         
         try:
             response = self.client.chat.completions.create(
-                model=DEFAULT_MODEL,
+                model=RELATIONSHIP_MODEL,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.3,
-                response_format={"type": "json_object"}
+                response_format=CLASSIFICATION_RESPONSE_FORMAT
             )
             
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(response.choices[0].message.content)
             return (
                 result['relationship_type'],
                 result['confidence'],
@@ -441,24 +923,34 @@ Return JSON:
                         article_id: int, 
                         remaining_depth: int,
                         visited: set) -> List[Dict[str, Any]]:
-        """Recursively explore impacts"""
-        if remaining_depth == 0 or article_id in visited:
-            return []
-        
-        visited.add(article_id)
-        relationships = self.discover_relationships(article_id, max_relationships=5)
-        
+        """Explore impacts level by level, discovering each level's relationships concurrently"""
         impacts = []
-        for rel in relationships:
-            impact = {
-                'article': self.articles[rel.target_id],
-                'relationship': rel.to_dict(),
-                'downstream_impacts': self._explore_impacts(
-                    rel.target_id, 
-                    remaining_depth - 1,
-                    visited.copy()
-                ) if remaining_depth > 1 else []
-            }
-            impacts.append(impact)
+        
+        # (article, levels left, articles already on its path, list its impacts go into)
+        frontier = [(article_id, remaining_depth, frozenset(visited), impacts)]
+        while frontier:
+            frontier = [entry for entry in frontier if entry[1] > 0 and entry[0] not in entry[2]]
+            if not frontier:
+                break
+            
+            article_ids = list(dict.fromkeys(entry[0] for entry in frontier))
+            discovered = self._loop.run_until_complete(
+                self._discover_relationships_many_async(article_ids, max_relationships=5)
+            )
+            
+            next_frontier = []
+            for current_id, levels_left, path, current_impacts in frontier:
+                path = path | {current_id}
+                for rel in discovered[current_id]:
+                    impact = {
+                        'article': self.articles[rel.target_id],
+                        'relationship': rel.to_dict(),
+                        'downstream_impacts': []
+                    }
+                    current_impacts.append(impact)
+                    if levels_left > 1:
+                        next_frontier.append((rel.target_id, levels_left - 1, path, impact['downstream_impacts']))
+            
+            frontier = next_frontier
         
         return impacts
\ No newline at end of file
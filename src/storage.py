@@ -0,0 +1,58 @@
+"""
+Article store loading for Article Relationship Engine
+Reads the news.json snapshot and its append-only journal without the engine dependencies
+"""
+
+import os
+import mmap
+from contextlib import nullcontext
+from typing import Dict, Any
+
+import orjson
+
+
+def journal_path_for(news_file_path: str) -> str:
+    """Path of the append-only journal that sits next to a news.json snapshot"""
+    return os.path.splitext(news_file_path)[0] + ".ndjson"
+
+
+def load_news_data(news_file_path: str = "news.json") -> Dict[str, Any]:
+    """
+    Load the article store: the JSON snapshot plus any journaled articles
+    
+    Journal lines whose ID is already in the snapshot (left over from an
+    interrupted compaction) and torn trailing lines are skipped.
+    """
+    data = {"articles": []}
+    if os.path.exists(news_file_path):
+        try:
+            # Parse straight from the page cache instead of copying the file into a bytes object
+            with open(news_file_path, 'rb') as f, _map_file(f) as mm, memoryview(mm) as view:
+                data = orjson.loads(view)
+        except orjson.JSONDecodeError:
+            print(f"Warning: Could not parse {news_file_path}, starting fresh")
+    
+    journal_path = journal_path_for(news_file_path)
+    if os.path.exists(journal_path) and os.path.getsize(journal_path) > 0:
+        seen_ids = {article["id"] for article in data["articles"]}
+        with open(journal_path, 'rb') as f, _map_file(f) as mm:
+            for line in iter(mm.readline, b""):
+                if not line.strip():
+                    continue
+                try:
+                    article = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    print(f"Warning: Skipping unreadable line in {journal_path}")
+                    continue
+                if article["id"] not in seen_ids:
+                    seen_ids.add(article["id"])
+                    data["articles"].append(article)
+    
+    return data
+
+
+def _map_file(f) -> Any:
+    """Read-only memory map of an open file; mmap rejects empty files, so those map to an empty buffer"""
+    if os.fstat(f.fileno()).st_size == 0:
+        return nullcontext(bytearray())
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
@@ -0,0 +1,18 @@
+import os
+
+import pytest
+import tiktoken
+
+# src.config refuses to import without a key; tests never reach the API
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+
+@pytest.fixture
+def byte_encoding():
+    """Offline tokenizer: one token per byte, plus the <|endoftext|> special token"""
+    return tiktoken.Encoding(
+        name="test_bytes",
+        pat_str=r"\S+|\s+",
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={"<|endoftext|>": 256},
+    )
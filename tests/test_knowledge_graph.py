@@ -0,0 +1,114 @@
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+import networkx as nx
+import pytest
+import rustworkx as rx
+
+from src import knowledge_graph
+from src.knowledge_graph import KnowledgeGraph
+
+
+EDGE_TYPES = ["SUPPLY_CHAIN", "MARKET_EFFECT", "REGULATORY", "COMPETITIVE"]
+
+
+def _bare_graph():
+    """KnowledgeGraph with only its graph and rustworkx mirror, no engines"""
+    graph = KnowledgeGraph.__new__(KnowledgeGraph)
+    graph.graph = nx.MultiDiGraph()
+    graph._rx_graph = rx.PyDiGraph(multigraph=False)
+    graph._nx_to_rx = {}
+    return graph
+
+
+def _random_graph(seed, events=40, edges=120):
+    rng = random.Random(seed)
+    graph = _bare_graph()
+    for i in range(events):
+        graph._add_graph_node(f"event_{i}", node_type='event')
+    for i in range(events):
+        graph._add_graph_edge(f"entity_{i % 7}", f"event_{i}", key='MENTIONED_IN')
+    for _ in range(edges):
+        source, target = rng.sample(range(events), 2)
+        graph._add_graph_edge(f"event_{source}", f"event_{target}", key=rng.choice(EDGE_TYPES))
+    for i in range(events):
+        graph._add_graph_edge(f"event_{i}", f"concept_category_{i % 3}", key='BELONGS_TO')
+    return graph
+
+
+def _baseline_cascade_counts(graph):
+    """Cascade signature counts as computed before the rustworkx port"""
+    pattern_counter = defaultdict(int)
+    for node in graph.nodes():
+        if not node.startswith('event_'):
+            continue
+        paths = nx.single_source_shortest_path(graph, node, cutoff=3)
+        for target, path in paths.items():
+            if len(path) >= 3 and target.startswith('event_'):
+                pattern_sig = []
+                for i in range(len(path) - 1):
+                    edges = graph.get_edge_data(path[i], path[i + 1])
+                    if edges:
+                        pattern_sig.append(list(edges.keys())[0])
+                if pattern_sig:
+                    pattern_counter[tuple(pattern_sig)] += 1
+    return {sig: count for sig, count in pattern_counter.items() if count >= 2}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_cascade_pattern_counts_match_baseline(seed):
+    graph = _random_graph(seed)
+    patterns = graph._find_cascade_patterns()
+    assert {tuple(pattern.edges): pattern.frequency for pattern in patterns} == _baseline_cascade_counts(graph.graph)
+
+
+def test_parallel_cascade_counts_match_serial(monkeypatch):
+    graph = _random_graph(0)
+    serial = {tuple(pattern.edges): pattern.frequency for pattern in graph._find_cascade_patterns()}
+    
+    monkeypatch.setattr(knowledge_graph, "PARALLEL_CASCADE_MIN_EVENTS", 0)
+    parallel = {tuple(pattern.edges): pattern.frequency for pattern in graph._find_cascade_patterns()}
+    
+    assert parallel == serial
+
+
+def test_cascade_workers_import_without_config():
+    env = {name: value for name, value in os.environ.items() if name != "OPENAI_API_KEY"}
+    code = "import sys, src.cascade; assert 'src.config' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                   cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _rendered_datasets(html):
+    nodes = json.loads(re.search(r"nodes = new vis\.DataSet\((.*?)\);", html).group(1))
+    edges = json.loads(re.search(r"edges = new vis\.DataSet\((.*?)\);", html).group(1))
+    return nodes, edges
+
+
+def test_visualize_subgraph_renders_capped_neighborhood(tmp_path, monkeypatch):
+    pytest.importorskip("pyvis")
+    monkeypatch.chdir(tmp_path)  # pyvis copies its JS assets into the working directory
+    graph = _bare_graph()
+    graph._add_graph_node("event_0", node_type='event', label="Center story")
+    for i in range(1, 13):
+        graph._add_graph_node(f"event_{i}", node_type='event', label=f"Story {i}")
+        graph._add_graph_edge("event_0", f"event_{i}", key='MARKET_EFFECT', weight=0.8)
+    # Reverse and parallel edges collapse into one undirected line
+    graph._add_graph_edge("event_1", "event_0", key='SUPPLY_CHAIN', weight=0.5)
+    graph._add_graph_edge("event_0", "event_1", key='REGULATORY', weight=0.5)
+    
+    output_file = tmp_path / "graph.html"
+    graph.visualize_subgraph("Center story", depth=1, output_file=str(output_file))
+    nodes, edges = _rendered_datasets(output_file.read_text())
+    
+    # Center, the 10 neighbors under the first-hop cap and one "+2 more" node
+    assert len(nodes) == 12
+    assert len({node["id"] for node in nodes}) == 12
+    assert {"event_0", "more_event_0"} <= {node["id"] for node in nodes}
+    assert len(edges) == 11
+    assert {(edge["from"], edge["to"]) for edge in edges if edge.get("dashes")} == {("event_0", "more_event_0")}
@@ -0,0 +1,76 @@
+import orjson
+import pytest
+
+from src import news_ingestion
+from src.news_ingestion import NewsIngestionEngine, _truncate_tokens
+from src.storage import load_news_data
+
+
+SPECIAL_TOKEN_TEXT = "Refinery output fell <|endoftext|> as crude prices rose. "
+
+
+@pytest.fixture(autouse=True)
+def offline_encoding(monkeypatch, byte_encoding):
+    monkeypatch.setattr(news_ingestion, "_get_encoding", lambda: byte_encoding)
+    _truncate_tokens.cache_clear()
+    yield
+    _truncate_tokens.cache_clear()
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return NewsIngestionEngine(str(tmp_path / "news.json"))
+
+
+def test_truncate_tokens_treats_special_tokens_as_text():
+    text = SPECIAL_TOKEN_TEXT * 50
+    truncated = _truncate_tokens(text, 40)
+    assert truncated == text[:40]
+
+
+def test_pack_analysis_batches_accepts_special_token_text(engine):
+    articles = [
+        {"title": f"Story {i} <|endoftext|>", "category": "Business", "content": SPECIAL_TOKEN_TEXT * 10}
+        for i in range(5)
+    ]
+    batches = engine._pack_analysis_batches(articles)
+    assert sorted(i for batch in batches for i in batch) == list(range(5))
+
+
+def _article(article_id, title, timestamp):
+    return {
+        "id": article_id, "title": title, "content": f"{title} content", "timestamp": timestamp,
+        "source": "Wire", "category": "Business", "entities": [], "tags": [],
+        "sentiment": "neutral", "impact_score": 5.0,
+    }
+
+
+def test_compact_folds_journal_and_rebuilds_indexes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "news.json").write_bytes(orjson.dumps({"articles": [_article(2, "Copper rally", "2024-01-02T00:00:00")]}))
+    (tmp_path / "news.ndjson").write_bytes(orjson.dumps(_article(1, "Steel tariff", "2024-01-03T00:00:00")) + b"\n")
+    engine = NewsIngestionEngine(str(tmp_path / "news.json"))
+    
+    engine.compact()
+    
+    assert not (tmp_path / "news.ndjson").exists()
+    assert [article["id"] for article in load_news_data(str(tmp_path / "news.json"))["articles"]] == [1, 2]
+    assert [article["id"] for article in engine.search_articles("steel")] == [1]
+    assert [article["id"] for article in engine.get_recent_articles(2)] == [1, 2]
+
+
+def test_ingest_batch_compacts_once_journal_is_due(engine, tmp_path, monkeypatch):
+    monkeypatch.setattr(news_ingestion, "JOURNAL_COMPACTION_THRESHOLD", 2)
+    articles = [
+        {key: value for key, value in _article(0, title, timestamp).items() if key != "id"}
+        for title, timestamp in [("Steel tariff", "2024-01-03T00:00:00"), ("Copper rally", "2024-01-02T00:00:00")]
+    ]
+    
+    ingested = engine.ingest_batch(articles)
+    
+    assert not (tmp_path / "news.ndjson").exists()
+    assert len(load_news_data(str(tmp_path / "news.json"))["articles"]) == 2
+    assert [article["title"] for article in engine.search_articles("copper")] == ["Copper rally"]
+    assert [article["id"] for article in engine.get_recent_articles(1)] == [ingested[0].id]
+    engine.close()